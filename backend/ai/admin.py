@@ -0,0 +1,32 @@
+from django.contrib import admin
+from .models import AIJob, AIResponse, DestinationInsight
+
+
+@admin.register(AIResponse)
+class AIResponseAdmin(admin.ModelAdmin):
+    """Admin interface for cached AI responses"""
+    list_display = ('method', 'model_name', 'hits', 'created_at', 'last_used_at', 'expires_at')
+    list_filter = ('method', 'model_name')
+    search_fields = ('content',)
+    ordering = ('-last_used_at',)
+    readonly_fields = ('key', 'created_at')
+
+
+@admin.register(DestinationInsight)
+class DestinationInsightAdmin(admin.ModelAdmin):
+    """Admin interface for precomputed destination insights"""
+    list_display = ('destination_name', 'season', 'model_name', 'generated_at')
+    list_filter = ('season', 'model_name')
+    search_fields = ('destination_name', 'tips')
+    ordering = ('destination_name',)
+    readonly_fields = ('generated_at',)
+
+
+@admin.register(AIJob)
+class AIJobAdmin(admin.ModelAdmin):
+    """Admin interface for queued AI jobs"""
+    list_display = ('method', 'user', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status', 'method')
+    search_fields = ('user__username', 'error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
@@ -0,0 +1,309 @@
+"""
+Client-side rate governor for Groq completions.
+
+Requests-per-minute and tokens-per-minute budgets are enforced with counters
+in Django's cache, so every gunicorn worker draws from the same buckets when
+CACHE_BACKEND is shared (Redis, Memcached). The buckets refill every
+AI_RATE_WINDOW seconds with the matching share of the per-minute quota.
+
+A call that finds the buckets empty waits for the next refill, bounded by a
+per-process wait queue and a deadline; when the queue is full or the deadline
+cannot be met it fails fast with RateLimitExceeded instead of piling onto an
+upstream that is already answering 429. A 429 that does get through blocks
+all workers for its Retry-After period. Waits never run past the request
+deadline (see deadlines.py). The async methods use the cache's async API so
+a network cache backend doesn't block the event loop.
+"""
+import asyncio
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from deadlines import remaining
+
+# Used when a 429 arrives without a usable Retry-After header
+DEFAULT_RETRY_AFTER = 5.0
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a completion cannot be scheduled within the rate limits"""
+
+    def __init__(self, retry_after):
+        self.retry_after = max(1, round(retry_after))
+        super().__init__(
+            f'The AI service is busy right now, please try again in {self.retry_after} seconds.'
+        )
+
+
+def _retry_after(error):
+    """
+    Return the Retry-After delay of a 429 error from the Groq SDK.
+
+    Returns:
+        float: Seconds to wait, or None if the error isn't a 429
+    """
+    if getattr(error, 'status_code', None) != 429:
+        return None
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers['retry-after'])
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class RateGovernor:
+    """
+    Pace completions to stay within request and token budgets.
+
+    Token usage is reserved up front as the prompt estimate plus max_tokens,
+    then settled against the usage the API reports, so throughput stays close
+    to the real quota.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, window=10,
+                 max_queue=20, max_wait=15.0, prefix='ai:rate'):
+        """
+        Args:
+            requests_per_minute: Requests budget (0 disables the governor)
+            tokens_per_minute: Tokens budget (0 disables the token limit)
+            window: Seconds between bucket refills
+            max_queue: Calls allowed to wait in this process before failing fast
+            max_wait: Longest a call waits for capacity, in seconds
+            prefix: Cache key prefix
+        """
+        self.enabled = requests_per_minute > 0
+        self.window = window
+        self.requests_per_window = max(1, round(requests_per_minute * window / 60))
+        self.tokens_per_window = round(tokens_per_minute * window / 60)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.prefix = prefix
+        self._waiting = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        """Build a governor from the AI_RATE_* settings."""
+        return cls(
+            requests_per_minute=settings.AI_RATE_LIMIT_RPM,
+            tokens_per_minute=settings.AI_RATE_LIMIT_TPM,
+            window=settings.AI_RATE_WINDOW,
+            max_queue=settings.AI_RATE_QUEUE_SIZE,
+            max_wait=settings.AI_RATE_MAX_WAIT,
+        )
+
+    @staticmethod
+    def estimate(prompt, max_tokens):
+        """Estimate the tokens a completion will use (about 4 characters per prompt token)."""
+        return len(prompt) // 4 + max_tokens
+
+    def _key(self, kind, window=None):
+        return f'{self.prefix}:{kind}' if window is None else f'{self.prefix}:{kind}:{window}'
+
+    def _incr(self, key, delta):
+        try:
+            return cache.incr(key, delta)
+        except ValueError:
+            # Bucket missing or just expired; add() keeps concurrent starts from resetting it
+            cache.add(key, 0, timeout=self.window * 2)
+            return cache.incr(key, delta)
+
+    async def _aincr(self, key, delta):
+        try:
+            return await cache.aincr(key, delta)
+        except ValueError:
+            await cache.aadd(key, 0, timeout=self.window * 2)
+            return await cache.aincr(key, delta)
+
+    def _try_reserve(self, tokens):
+        """
+        Take one request and `tokens` tokens from the current window's buckets.
+
+        Returns:
+            tuple: (window, None) on success, or (None, time.time() to retry at)
+        """
+        now = time.time()
+        blocked_until = cache.get(self._key('blocked-until')) or 0
+        if blocked_until > now:
+            return None, blocked_until
+
+        window = int(now // self.window)
+        requests_key, tokens_key = self._key('requests', window), self._key('tokens', window)
+        requests = self._incr(requests_key, 1)
+        used = self._incr(tokens_key, tokens)
+        # A single call larger than the whole token budget may still run alone
+        if requests <= self.requests_per_window and (
+                not self.tokens_per_window or used <= self.tokens_per_window or used == tokens):
+            return window, None
+
+        cache.decr(requests_key)
+        cache.decr(tokens_key, tokens)
+        return None, (window + 1) * self.window
+
+    async def _atry_reserve(self, tokens):
+        """Async version of _try_reserve()"""
+        now = time.time()
+        blocked_until = await cache.aget(self._key('blocked-until')) or 0
+        if blocked_until > now:
+            return None, blocked_until
+
+        window = int(now // self.window)
+        requests_key, tokens_key = self._key('requests', window), self._key('tokens', window)
+        requests = await self._aincr(requests_key, 1)
+        used = await self._aincr(tokens_key, tokens)
+        if requests <= self.requests_per_window and (
+                not self.tokens_per_window or used <= self.tokens_per_window or used == tokens):
+            return window, None
+
+        await cache.adecr(requests_key)
+        await cache.adecr(tokens_key, tokens)
+        return None, (window + 1) * self.window
+
+    def _enter_queue(self, retry_at, deadline):
+        """Join the wait queue, or raise if it is full or the deadline can't be met."""
+        if retry_at > deadline:
+            raise RateLimitExceeded(retry_at - time.time())
+        with self._lock:
+            if self._waiting >= self.max_queue:
+                raise RateLimitExceeded(retry_at - time.time())
+            self._waiting += 1
+
+    def _leave_queue(self):
+        with self._lock:
+            self._waiting -= 1
+
+    @staticmethod
+    def _delay(retry_at):
+        # Jitter keeps queued callers from all retrying at the window boundary
+        return max(0.0, retry_at - time.time()) + random.uniform(0, 0.25)
+
+    def acquire(self, tokens, deadline):
+        """
+        Wait until a call of `tokens` tokens fits the budgets.
+
+        Args:
+            tokens: Estimated tokens for the call
+            deadline: time.time() after which to give up
+
+        Returns:
+            int: The window the call was counted in
+
+        Raises:
+            RateLimitExceeded: The queue is full or the deadline would pass
+        """
+        window, retry_at = self._try_reserve(tokens)
+        if window is not None:
+            return window
+
+        self._enter_queue(retry_at, deadline)
+        try:
+            while window is None:
+                time.sleep(self._delay(retry_at))
+                window, retry_at = self._try_reserve(tokens)
+                if window is None and retry_at > deadline:
+                    raise RateLimitExceeded(retry_at - time.time())
+            return window
+        finally:
+            self._leave_queue()
+
+    async def aacquire(self, tokens, deadline):
+        """Async version of acquire()"""
+        window, retry_at = await self._atry_reserve(tokens)
+        if window is not None:
+            return window
+
+        self._enter_queue(retry_at, deadline)
+        try:
+            while window is None:
+                await asyncio.sleep(self._delay(retry_at))
+                window, retry_at = await self._atry_reserve(tokens)
+                if window is None and retry_at > deadline:
+                    raise RateLimitExceeded(retry_at - time.time())
+            return window
+        finally:
+            self._leave_queue()
+
+    def _settle(self, window, reserved, response):
+        """Give back reserved tokens the response didn't use."""
+        used = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+        if isinstance(used, int) and used < reserved:
+            try:
+                cache.decr(self._key('tokens', window), reserved - used)
+            except ValueError:
+                pass  # Window already expired
+
+    async def _asettle(self, window, reserved, response):
+        """Async version of _settle()"""
+        used = getattr(getattr(response, 'usage', None), 'total_tokens', None)
+        if isinstance(used, int) and used < reserved:
+            try:
+                await cache.adecr(self._key('tokens', window), reserved - used)
+            except ValueError:
+                pass
+
+    def block_for(self, seconds):
+        """Stop all workers from calling upstream for `seconds` seconds."""
+        until = time.time() + seconds
+        cache.set(self._key('blocked-until'), until, timeout=max(1, round(seconds)) + 1)
+
+    async def ablock_for(self, seconds):
+        """Async version of block_for()"""
+        until = time.time() + seconds
+        await cache.aset(self._key('blocked-until'), until, timeout=max(1, round(seconds)) + 1)
+
+    def _deadline(self):
+        """time.time() after which a call stops waiting for capacity."""
+        left = remaining()
+        return time.time() + (self.max_wait if left is None else min(self.max_wait, left))
+
+    def call(self, create, tokens):
+        """
+        Run `create()` within the budgets, retrying 429s until the deadline.
+
+        Args:
+            create: Zero-argument callable making the API request
+            tokens: Estimated tokens for the request
+
+        Returns:
+            The value returned by create()
+        """
+        if not self.enabled:
+            return create()
+        deadline = self._deadline()
+        while True:
+            window = self.acquire(tokens, deadline)
+            try:
+                response = create()
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None:
+                    raise
+                self.block_for(retry_after)
+                if time.time() + retry_after > deadline:
+                    raise RateLimitExceeded(retry_after) from e
+                continue
+            self._settle(window, tokens, response)
+            return response
+
+    async def acall(self, create, tokens):
+        """Async version of call(); `create` is a coroutine function"""
+        if not self.enabled:
+            return await create()
+        deadline = self._deadline()
+        while True:
+            window = await self.aacquire(tokens, deadline)
+            try:
+                response = await create()
+            except Exception as e:
+                retry_after = _retry_after(e)
+                if retry_after is None:
+                    raise
+                await self.ablock_for(retry_after)
+                if time.time() + retry_after > deadline:
+                    raise RateLimitExceeded(retry_after) from e
+                continue
+            await self._asettle(window, tokens, response)
+            return response
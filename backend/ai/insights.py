@@ -0,0 +1,129 @@
+"""
+Precomputed AI travel tips per destination and season.
+
+Tips are stored as DestinationInsight rows by the generate_insights command,
+refreshed in the background when a destination's name or season changes or
+the row passes AI_INSIGHT_MAX_AGE, and generated live only when missing.
+"""
+import logging
+import threading
+
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+from ai_assistant import ai_assistant
+
+from .models import DestinationInsight
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on how long one background refresh may hold its lock
+REFRESH_LOCK_TIMEOUT = 5 * 60
+
+
+def get_insight(destination):
+    """
+    Return the stored insight for a destination's current name and season.
+
+    Args:
+        destination: Destination instance
+
+    Returns:
+        DestinationInsight: The matching insight, or None if missing or outdated
+    """
+    insight = DestinationInsight.objects.filter(
+        destination=destination, season=destination.best_season
+    ).first()
+    if insight is None or not insight.matches(destination):
+        return None
+    return insight
+
+
+def save_insight(destination, tips_result):
+    """
+    Store a successful get_travel_tips() result for a destination.
+
+    Args:
+        destination: Destination the tips are for
+        tips_result: Dict returned by get_travel_tips()
+
+    Returns:
+        DestinationInsight: The stored insight, or None if generation failed
+    """
+    if not tips_result.get('success'):
+        return None
+    insight, _ = DestinationInsight.objects.update_or_create(
+        destination=destination,
+        season=destination.best_season,
+        defaults={
+            'destination_name': destination.name,
+            'tips': tips_result['tips'],
+            'model_name': ai_assistant.model_for('get_travel_tips'),
+            'generated_at': timezone.now(),
+        },
+    )
+    return insight
+
+
+def refresh_insight(destination, force=False):
+    """
+    Generate and store fresh tips for a destination.
+
+    Args:
+        destination: Destination instance
+        force: Bypass the AI response cache so the tips are regenerated
+
+    Returns:
+        DestinationInsight: The stored insight, or None if generation failed
+    """
+    tips_result = ai_assistant.get_travel_tips(
+        destination.name, destination.best_season, use_cache=not force
+    )
+    return save_insight(destination, tips_result)
+
+
+def _refresh_in_background(destination_id, force):
+    """Thread body for schedule_refresh(); always releases the lock."""
+    from destinations.models import Destination
+    try:
+        destination = Destination.objects.filter(pk=destination_id).first()
+        if destination is not None:
+            refresh_insight(destination, force=force)
+    except Exception:
+        logger.exception('Background insight refresh failed for destination %s', destination_id)
+    finally:
+        cache.delete(f'ai:insight-refresh:{destination_id}')
+        connections.close_all()
+
+
+def schedule_refresh(destination, force=False):
+    """Refresh a destination's insight in a background thread unless one is already running."""
+    if cache.add(f'ai:insight-refresh:{destination.pk}', True, timeout=REFRESH_LOCK_TIMEOUT):
+        threading.Thread(
+            target=_refresh_in_background, args=(destination.pk, force), daemon=True
+        ).start()
+
+
+def get_destination_tips(destination):
+    """
+    Return travel tips for a destination, preferring the stored insight.
+
+    A stale insight is served while a background refresh replaces it; a
+    missing one is generated live and stored for the next request.
+
+    Args:
+        destination: Destination instance
+
+    Returns:
+        dict: Result in the get_travel_tips() format
+    """
+    insight = get_insight(destination)
+    if insight is not None:
+        if insight.is_stale():
+            schedule_refresh(destination, force=True)
+        return insight.as_tips()
+
+    tips_result = ai_assistant.get_travel_tips(destination.name, destination.best_season)
+    save_insight(destination, tips_result)
+    return tips_result
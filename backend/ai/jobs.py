@@ -0,0 +1,115 @@
+"""
+Database-backed queue for slow AI generations.
+
+Views enqueue an AIJob and return at once; the run_ai_jobs management command
+claims pending jobs and runs them on its own thread pool, so generation
+concurrency is set by the worker (AI_JOB_CONCURRENCY) rather than by how many
+web workers are stuck waiting on Groq. Pages poll the job status endpoint.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ai_assistant import ai_assistant
+
+from .models import AIJob
+
+logger = logging.getLogger(__name__)
+
+# Pending jobs looked at per claim attempt; others may be taken concurrently
+CLAIM_BATCH = 10
+
+
+def enqueue_job(method, user=None, **params):
+    """
+    Queue a TravelAIAssistant call for the worker.
+
+    Args:
+        method: Name of the assistant method (one of AIJob's method choices)
+        user: User the job belongs to
+        **params: Keyword arguments for the method (JSON-serializable)
+
+    Returns:
+        AIJob: The pending job
+    """
+    if method not in dict(AIJob._meta.get_field('method').choices):
+        raise ValueError(f'Unsupported AI job method: {method}')
+    return AIJob.objects.create(method=method, user=user, params=params)
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest pending job to running.
+
+    The conditional UPDATE lets several worker threads and processes claim
+    jobs on any database without row locks.
+
+    Returns:
+        AIJob: The claimed job, or None if nothing is pending
+    """
+    pending = AIJob.objects.filter(status=AIJob.STATUS_PENDING).order_by('created_at')
+    for job_id in pending.values_list('pk', flat=True)[:CLAIM_BATCH]:
+        claimed = AIJob.objects.filter(pk=job_id, status=AIJob.STATUS_PENDING).update(
+            status=AIJob.STATUS_RUNNING,
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return AIJob.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    """
+    Run a claimed job and store its outcome.
+
+    Args:
+        job: AIJob in the running state
+
+    Returns:
+        AIJob: The finished job
+    """
+    try:
+        result = getattr(ai_assistant, job.method)(**job.params)
+    except Exception as e:
+        logger.exception('AI job %s crashed', job.pk)
+        result = {'success': False, 'error': f'AI service error: {str(e)}'}
+
+    job.result = result
+    job.status = AIJob.STATUS_DONE if result.get('success') else AIJob.STATUS_FAILED
+    job.error = '' if result.get('success') else result.get('error', '')
+    job.finished_at = timezone.now()
+    job.save(update_fields=['result', 'status', 'error', 'finished_at'])
+    return job
+
+
+def recover_jobs():
+    """
+    Housekeeping for the worker.
+
+    Jobs left running longer than AI_JOB_TIMEOUT (their worker died) are
+    retried up to AI_JOB_MAX_ATTEMPTS times, then failed; finished jobs older
+    than AI_JOB_RETENTION are deleted.
+
+    Returns:
+        tuple: (requeued, failed, deleted) counts
+    """
+    now = timezone.now()
+    stuck = AIJob.objects.filter(
+        status=AIJob.STATUS_RUNNING,
+        started_at__lt=now - timedelta(seconds=settings.AI_JOB_TIMEOUT),
+    )
+    requeued = stuck.filter(attempts__lt=settings.AI_JOB_MAX_ATTEMPTS).update(status=AIJob.STATUS_PENDING)
+    failed = stuck.update(
+        status=AIJob.STATUS_FAILED,
+        error='The AI job timed out. Please try again.',
+        finished_at=now,
+    )
+    deleted, _ = AIJob.objects.filter(
+        Q(status=AIJob.STATUS_DONE) | Q(status=AIJob.STATUS_FAILED),
+        finished_at__lt=now - timedelta(seconds=settings.AI_JOB_RETENTION),
+    ).delete()
+    return requeued, failed, deleted
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ai.insights import get_insight, refresh_insight
+from destinations.models import Destination
+
+
+class Command(BaseCommand):
+    """
+    Precompute AI travel tips for every destination's best season.
+
+    Run it after loading destinations and periodically (e.g. daily); it only
+    regenerates insights that are missing, outdated by a rename or season
+    change, or older than AI_INSIGHT_MAX_AGE.
+    """
+    help = 'Generate missing or stale AI insights for destinations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate every insight, even fresh ones')
+
+    def handle(self, *args, **options):
+        if not settings.GROQ_API_KEY:
+            raise CommandError('GROQ_API_KEY is not configured.')
+
+        generated = skipped = failed = 0
+        for destination in Destination.objects.all():
+            insight = get_insight(destination)
+            if insight is not None and not insight.is_stale() and not options['force']:
+                skipped += 1
+                continue
+
+            # A missing insight may still be answered by the response cache
+            if refresh_insight(destination, force=insight is not None or options['force']) is None:
+                self.stderr.write(f'{destination}: generation failed')
+                failed += 1
+                continue
+            generated += 1
+            self.stdout.write(f'{destination}: insight for {destination.best_season} generated')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {generated} insight(s), {skipped} up to date, {failed} failed.'
+        ))
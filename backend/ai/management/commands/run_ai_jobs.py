@@ -0,0 +1,85 @@
+import signal
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from ai.jobs import claim_next_job, recover_jobs, run_job
+from ai_assistant import ai_assistant
+
+# Seconds between housekeeping passes (stuck job recovery, purging)
+HOUSEKEEPING_INTERVAL = 60
+
+
+class Command(BaseCommand):
+    """
+    Run queued AI jobs outside the request cycle.
+
+    Each worker thread claims one pending job at a time, so --concurrency is
+    the number of Groq generations this process runs in parallel. Several
+    worker processes can share the queue safely.
+    """
+    help = 'Process queued AI generation jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the pending jobs and exit')
+        parser.add_argument('--concurrency', type=int, default=settings.AI_JOB_CONCURRENCY,
+                            help='Jobs run in parallel (default: AI_JOB_CONCURRENCY)')
+        parser.add_argument('--poll-interval', type=float, default=settings.AI_JOB_POLL_INTERVAL,
+                            help='Seconds to wait when the queue is empty (default: AI_JOB_POLL_INTERVAL)')
+        parser.add_argument('--rate-wait', type=float, default=settings.AI_JOB_RATE_MAX_WAIT,
+                            help='Seconds a job may wait for Groq rate limit capacity (default: AI_JOB_RATE_MAX_WAIT)')
+
+    def _work(self, stop, once, poll_interval):
+        """Worker thread: claim and run jobs until stopped (or, with --once, until idle)."""
+        try:
+            while not stop.is_set():
+                job = claim_next_job()
+                if job is None:
+                    if once:
+                        return
+                    stop.wait(poll_interval)
+                    continue
+                run_job(job)
+                status = job.error if job.error else job.status
+                self.stdout.write(f'{job.method} #{job.pk}: {status}')
+        finally:
+            connections.close_all()
+
+    def handle(self, *args, **options):
+        # Nobody is waiting on a page here, so queue for capacity instead of failing fast
+        ai_assistant.governor.max_wait = options['rate_wait']
+        ai_assistant.governor.max_queue = max(ai_assistant.governor.max_queue, options['concurrency'])
+
+        requeued, failed, deleted = recover_jobs()
+        if requeued or failed:
+            self.stdout.write(f'Recovered stuck jobs: {requeued} requeued, {failed} failed.')
+
+        stop = threading.Event()
+        # Platform shutdowns send SIGTERM; let running jobs finish instead of stranding them
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        threads = [
+            threading.Thread(target=self._work, args=(stop, options['once'], options['poll_interval']), daemon=True)
+            for _ in range(options['concurrency'])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(self.style.SUCCESS(f"AI job worker started with {options['concurrency']} thread(s)."))
+
+        try:
+            last_housekeeping = time.monotonic()
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1)
+                if time.monotonic() - last_housekeeping >= HOUSEKEEPING_INTERVAL:
+                    recover_jobs()
+                    last_housekeeping = time.monotonic()
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping; waiting for running jobs to finish...')
+            stop.set()
+            for thread in threads:
+                thread.join()
+        finally:
+            connections.close_all()
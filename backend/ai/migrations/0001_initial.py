@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="AIResponse",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "key",
+                    models.CharField(
+                        help_text="Hash of method, inputs, model and temperature",
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("method", models.CharField(max_length=100)),
+                ("model_name", models.CharField(max_length=100)),
+                ("content", models.TextField()),
+                ("hits", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_used_at", models.DateTimeField(db_index=True)),
+                ("expires_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "AI Response",
+                "verbose_name_plural": "AI Responses",
+                "ordering": ["-last_used_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0001_initial"),
+        ("destinations", "0002_destination_weather_location"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DestinationInsight",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("season", models.CharField(max_length=50)),
+                (
+                    "destination_name",
+                    models.CharField(
+                        help_text="Destination name the tips were generated for; a rename makes them outdated",
+                        max_length=200,
+                    ),
+                ),
+                ("tips", models.TextField()),
+                ("model_name", models.CharField(max_length=100)),
+                ("generated_at", models.DateTimeField(db_index=True)),
+                (
+                    "destination",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="insights",
+                        to="destinations.destination",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Destination Insight",
+                "verbose_name_plural": "Destination Insights",
+                "ordering": ["destination__name", "season"],
+                "unique_together": {("destination", "season")},
+            },
+        ),
+    ]
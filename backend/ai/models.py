@@ -0,0 +1,136 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from destinations.models import Destination
+
+
+class AIResponse(models.Model):
+    """Model representing a cached AI completion (see ai_assistant.AIResponseCache)"""
+    key = models.CharField(max_length=64, unique=True, help_text="Hash of method, inputs, model and temperature")
+    method = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    content = models.TextField()
+    hits = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(db_index=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-last_used_at']
+        verbose_name = 'AI Response'
+        verbose_name_plural = 'AI Responses'
+
+    def __str__(self):
+        return f"{self.method} ({self.model_name})"
+
+
+class DestinationInsight(models.Model):
+    """Model representing precomputed AI travel tips for a destination and season"""
+    destination = models.ForeignKey(Destination, on_delete=models.CASCADE, related_name='insights')
+    season = models.CharField(max_length=50)
+    destination_name = models.CharField(
+        max_length=200,
+        help_text="Destination name the tips were generated for; a rename makes them outdated"
+    )
+    tips = models.TextField()
+    model_name = models.CharField(max_length=100)
+    generated_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['destination__name', 'season']
+        unique_together = ['destination', 'season']
+        verbose_name = 'Destination Insight'
+        verbose_name_plural = 'Destination Insights'
+
+    def __str__(self):
+        return f"{self.destination_name} ({self.season})"
+
+    def matches(self, destination):
+        """Whether the tips were generated for the destination's current name and season"""
+        return self.destination_name == destination.name and self.season == destination.best_season
+
+    def is_stale(self):
+        """Whether the tips are older than AI_INSIGHT_MAX_AGE"""
+        return timezone.now() - self.generated_at > timedelta(seconds=settings.AI_INSIGHT_MAX_AGE)
+
+    def as_tips(self):
+        """Return the insight in the get_travel_tips() result format"""
+        return {
+            'success': True,
+            'tips': self.tips,
+            'destination': self.destination_name,
+            'generated_at': self.generated_at,
+        }
+
+
+class AIJob(models.Model):
+    """Model representing a queued AI generation run by the run_ai_jobs worker"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='ai_jobs'
+    )
+    method = models.CharField(
+        max_length=50,
+        help_text="TravelAIAssistant method to run",
+        choices=[
+            ('generate_itinerary_plan', 'Itinerary plan'),
+            ('get_destination_recommendations', 'Destination recommendations'),
+            ('get_travel_tips', 'Travel tips'),
+            ('answer_travel_question', 'Travel question'),
+        ]
+    )
+    params = models.JSONField(default=dict, help_text="Keyword arguments for the method")
+    status = models.CharField(
+        max_length=10,
+        default=STATUS_PENDING,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_RUNNING, 'Running'),
+            (STATUS_DONE, 'Done'),
+            (STATUS_FAILED, 'Failed'),
+        ]
+    )
+    result = models.JSONField(null=True, blank=True, help_text="Dict returned by the method")
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        verbose_name = 'AI Job'
+        verbose_name_plural = 'AI Jobs'
+
+    def __str__(self):
+        return f"{self.method} #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_DONE, self.STATUS_FAILED)
+
+    def as_dict(self):
+        """Return the job state in the format the polling endpoint serves"""
+        return {
+            'id': self.pk,
+            'method': self.method,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat(),
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from destinations.models import Destination
+
+from .insights import get_insight, schedule_refresh
+
+
+@receiver(post_save, sender=Destination)
+def refresh_destination_insight(sender, instance, raw=False, **kwargs):
+    """Regenerate a destination's insight when its name or season changed"""
+    if raw or not settings.AI_INSIGHT_REFRESH_ON_SAVE or not settings.GROQ_API_KEY:
+        return
+    if get_insight(instance) is None:
+        transaction.on_commit(lambda: schedule_refresh(instance))
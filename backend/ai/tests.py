@@ -0,0 +1,403 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ai.governor import RateGovernor, RateLimitExceeded
+from ai.models import AIResponse
+from ai_assistant import AIResponseCache, IncompleteItinerary, SingleFlight, TravelAIAssistant
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from itineraries.parsing import parse_day_plans
+
+
+class ItineraryDaysTests(TestCase):
+    """Itinerary lengths outside 1..AI_ITINERARY_MAX_DAYS never reach Groq"""
+
+    def setUp(self):
+        self.assistant = TravelAIAssistant()
+
+    def test_assistant_rejects_out_of_range_days(self):
+        with mock.patch.object(TravelAIAssistant, '_complete') as complete:
+            for days in (0, -3, 31, 700):
+                result = self.assistant.generate_itinerary_plan('Goa', days, 'beaches')
+                self.assertFalse(result['success'])
+                self.assertEqual(result['error'], 'Please enter between 1 and 30 days.')
+                with self.assertRaises(ValueError):
+                    list(self.assistant.stream_itinerary_plan('Goa', days, 'beaches'))
+        complete.assert_not_called()
+
+    @override_settings(AI_JOBS_ENABLED=True)
+    def test_planner_rejects_out_of_range_days(self):
+        self.client.force_login(User.objects.create_user('traveller', password='secret'))
+        response = self.client.post(
+            reverse('ai-planner'), {'destination': 'Goa', 'days': '700', 'interests': 'beaches'},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Please enter between 1 and 30 days.'})
+
+
+@override_settings(AI_ITINERARY_CHUNK_DAYS=1, AI_ITINERARY_MAX_PARALLEL=1)
+class ChunkedItineraryTests(TestCase):
+    """Long itineraries are generated as day ranges and stitched in day order"""
+
+    def setUp(self):
+        self.assistant = TravelAIAssistant()
+
+    def test_first_failure_cancels_pending_ranges(self):
+        with mock.patch.object(TravelAIAssistant, '_complete', side_effect=RuntimeError('down')) as complete:
+            result = self.assistant.generate_itinerary_plan('Goa', 30, 'beaches')
+            with self.assertRaises(RuntimeError):
+                list(self.assistant.stream_itinerary_plan('Goa', 30, 'beaches'))
+        self.assertFalse(result['success'])
+        # One worker: the first range fails and the 29 queued ones never start
+        self.assertLessEqual(complete.call_count, 4)
+
+    def test_missing_days_are_an_error(self):
+        # Day 3 never comes back, not even from the retry
+        def complete(method, inputs, *args, **kwargs):
+            first, last = inputs[3], inputs[4]
+            return '\n'.join(f'DAY {day}:\nMorning: Beach' for day in range(first, last + 1) if day != 3)
+
+        with mock.patch.object(TravelAIAssistant, '_complete', side_effect=complete):
+            result = self.assistant.generate_itinerary_plan('Goa', 5, 'beaches')
+            self.assertFalse(result['success'])
+            self.assertEqual(result['missing_days'], [3])
+            with self.assertRaises(IncompleteItinerary):
+                list(self.assistant.stream_itinerary_plan('Goa', 5, 'beaches'))
+
+    def test_retry_fills_skipped_days(self):
+        calls = []
+
+        def complete(method, inputs, *args, **kwargs):
+            calls.append(inputs[3:])
+            first, last = inputs[3], inputs[4]
+            return '' if len(calls) == 1 else '\n'.join(f'DAY {day}:\nMorning: Beach' for day in range(first, last + 1))
+
+        with mock.patch.object(TravelAIAssistant, '_complete', side_effect=complete):
+            result = self.assistant.generate_itinerary_plan('Goa', 3, 'beaches')
+        self.assertTrue(result['success'])
+        self.assertEqual([day for day, _ in parse_day_plans(result['itinerary'])], [1, 2, 3])
+
+    @override_settings(AI_ITINERARY_CHUNK_DAYS=7)
+    def test_empty_answer_is_an_error(self):
+        with mock.patch.object(TravelAIAssistant, '_complete', return_value='  '):
+            result = self.assistant.generate_itinerary_plan('Goa', 3, 'beaches')
+        self.assertFalse(result['success'])
+        self.assertEqual(result['missing_days'], [1, 2, 3])
+
+
+class CircuitBreakerTests(TestCase):
+    """The breaker opens on a failure rate, probes when half-open and closes with fresh counts"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1200.0  # Outage and recovery fall in the same 60s window
+        patcher = mock.patch('circuit_breaker.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker('test', failure_rate=0.5, min_calls=5, window=60, open_seconds=30)
+
+    def fail(self):
+        with self.assertRaises(RuntimeError):
+            self.breaker.call(mock.Mock(side_effect=RuntimeError))
+
+    def test_open_half_open_closed_then_one_failure(self):
+        for _ in range(5):
+            self.fail()
+        self.assertEqual(self.breaker.state(), OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(mock.Mock())
+
+        self.now += 31
+        self.assertEqual(self.breaker.state(), HALF_OPEN)
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state(), CLOSED)
+        # The failures from before the outage no longer count
+        self.fail()
+        self.assertEqual(self.breaker.state(), CLOSED)
+
+    def test_async_probe_closes_with_fresh_counts(self):
+        async def ok():
+            return 'ok'
+
+        async def boom():
+            raise RuntimeError
+
+        async def run():
+            for _ in range(5):
+                with self.assertRaises(RuntimeError):
+                    await self.breaker.acall(boom)
+            self.assertEqual(await self.breaker.astate(), OPEN)
+            self.now += 31
+            self.assertEqual(await self.breaker.acall(ok), 'ok')
+            with self.assertRaises(RuntimeError):
+                await self.breaker.acall(boom)
+            self.assertEqual(await self.breaker.astate(), CLOSED)
+
+        asyncio.run(run())
+
+    def test_failed_probe_reopens(self):
+        for _ in range(5):
+            self.fail()
+        self.now += 31
+        self.fail()
+        self.assertEqual(self.breaker.state(), OPEN)
+
+    def test_ignored_errors_are_not_failures(self):
+        for _ in range(10):
+            with self.assertRaises(ValueError):
+                self.breaker.call(mock.Mock(side_effect=ValueError), is_failure=lambda e: False)
+        self.assertEqual(self.breaker.state(), CLOSED)
+
+
+class Upstream429(Exception):
+    """Stand-in for a Groq 429 error"""
+    status_code = 429
+
+    def __init__(self, retry_after):
+        super().__init__('rate limited')
+        self.response = mock.Mock(headers={'retry-after': str(retry_after)})
+
+
+def completion(total_tokens):
+    return mock.Mock(usage=mock.Mock(total_tokens=total_tokens))
+
+
+class RateGovernorTests(TestCase):
+    """Calls are paced within the request and token budgets shared through the cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 6000.0  # Start of a 10s window
+        for target in ('ai.governor.time.time', 'ai.governor.time.sleep', 'ai.governor.random.uniform'):
+            patcher = mock.patch(target)
+            self.addCleanup(patcher.stop)
+            patched = patcher.start()
+            if target.endswith('time.time'):
+                patched.side_effect = lambda: self.now
+            elif target.endswith('sleep'):
+                patched.side_effect = self.sleep
+            else:
+                patched.return_value = 0
+        # 6 requests and 600 tokens per 10s window
+        self.governor = RateGovernor(36, 3600, window=10, max_queue=2, max_wait=15.0)
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+    def usage(self, kind):
+        return cache.get(self.governor._key(kind, int(self.now // 10))) or 0
+
+    def test_reserves_and_refunds_unused_tokens(self):
+        response = self.governor.call(lambda: completion(40), 100)
+        self.assertEqual(response.usage.total_tokens, 40)
+        self.assertEqual((self.usage('requests'), self.usage('tokens')), (1, 40))
+
+    def test_full_bucket_rolls_back_and_waits_for_next_window(self):
+        for _ in range(6):
+            self.governor.call(lambda: completion(10), 10)
+        self.governor.call(lambda: completion(10), 10)
+        # The seventh call waited for the next window and only counted there
+        self.assertEqual(self.now, 6010.0)
+        self.assertEqual(self.usage('requests'), 1)
+        self.assertEqual(cache.get(self.governor._key('requests', 600)), 6)
+
+    def test_token_budget(self):
+        self.governor.call(lambda: completion(500), 500)
+        self.governor.call(lambda: completion(200), 200)
+        self.assertEqual(self.now, 6010.0)
+        # A call larger than a whole window's budget still runs on its own
+        self.governor.call(lambda: completion(900), 900)
+        self.assertEqual(self.now, 6020.0)
+
+    def test_429_blocks_everyone_for_retry_after(self):
+        create = mock.Mock(side_effect=[Upstream429(3), completion(10)])
+        self.governor.call(create, 10)
+        self.assertEqual(create.call_count, 2)
+        self.assertGreaterEqual(self.now, 6003.0)
+
+        with self.assertRaises(RateLimitExceeded):
+            self.governor.call(mock.Mock(side_effect=Upstream429(60)), 10)
+
+    def test_fails_fast_past_deadline(self):
+        governor = RateGovernor(36, 3600, window=10, max_wait=5.0)
+        for _ in range(6):
+            governor.call(lambda: completion(10), 10)
+        create = mock.Mock()
+        self.now += 1
+        with self.assertRaises(RateLimitExceeded) as raised:
+            governor.call(create, 10)
+        create.assert_not_called()
+        self.assertEqual(raised.exception.retry_after, 9)
+
+    def test_fails_fast_when_queue_is_full(self):
+        for _ in range(6):
+            self.governor.call(lambda: completion(10), 10)
+        self.governor._waiting = self.governor.max_queue
+        with self.assertRaises(RateLimitExceeded):
+            self.governor.call(mock.Mock(), 10)
+
+    def test_request_deadline_caps_the_wait(self):
+        for _ in range(6):
+            self.governor.call(lambda: completion(10), 10)
+        with mock.patch('ai.governor.remaining', return_value=2.0):
+            with self.assertRaises(RateLimitExceeded):
+                self.governor.call(mock.Mock(), 10)
+
+    def test_async_call(self):
+        async def create():
+            return completion(30)
+
+        async def run():
+            for _ in range(7):
+                await self.governor.acall(create, 50)
+
+        with mock.patch('ai.governor.asyncio.sleep', side_effect=self.async_sleep):
+            asyncio.run(run())
+        self.assertEqual(self.now, 6010.0)
+        self.assertEqual((self.usage('requests'), self.usage('tokens')), (1, 30))
+
+    async def async_sleep(self, seconds):
+        self.now += seconds
+
+
+class SingleFlightTests(SimpleTestCase):
+    """Concurrent identical completions share one upstream call"""
+
+    def setUp(self):
+        cache.clear()
+        self.responses = AIResponseCache()
+        self.flight = SingleFlight(self.responses, lock_timeout=5, poll_interval=0.01)
+
+    def test_concurrent_callers_share_one_call(self):
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'answer'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.flight.do('k', fetch))) for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(results, ['answer'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(cache.get('ai:inflight:k'))
+
+    def test_leader_error_reaches_waiters_and_next_call_retries(self):
+        started, release = threading.Event(), threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise RuntimeError('down')
+
+        errors = []
+
+        def call():
+            try:
+                self.flight.do('k', fail)
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(self.flight.do('k', lambda: 'recovered'), 'recovered')
+
+    def test_other_worker_holding_the_lock(self):
+        # Another process is computing the answer: wait for it in the response cache
+        cache.add('ai:inflight:k', True)
+        fetch = mock.Mock(return_value='mine')
+        threading.Timer(0.05, lambda: cache.set('ai:response:k', 'theirs')).start()
+        self.assertEqual(self.flight.do('k', fetch), 'theirs')
+        fetch.assert_not_called()
+
+    def test_abandoned_lock_falls_back_to_own_call(self):
+        cache.add('ai:inflight:k', True)
+        self.flight.lock_timeout = 0.05
+        self.assertEqual(self.flight.do('k', lambda: 'mine'), 'mine')
+
+    def test_async_callers_share_one_call(self):
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return 'answer'
+
+        async def run():
+            return await asyncio.gather(*[self.flight.ado('k', fetch) for _ in range(5)])
+
+        self.assertEqual(asyncio.run(run()), ['answer'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertIsNone(cache.get('ai:inflight:k'))
+
+
+class AIResponseCacheTests(TestCase):
+    """Completions are cached in Django's cache and the bounded AIResponse table"""
+
+    def setUp(self):
+        cache.clear()
+        self.responses = AIResponseCache()
+
+    def test_keys_ignore_whitespace_and_case(self):
+        key = self.responses.make_key('get_travel_tips', ('  Goa ', 'Winter'), 'model', 0.7)
+        self.assertEqual(key, self.responses.make_key('get_travel_tips', ('goa', 'winter'), 'model', 0.7))
+        self.assertNotEqual(key, self.responses.make_key('get_travel_tips', ('goa', 'winter'), 'model', 0.2))
+
+    def test_table_outlives_the_django_cache(self):
+        self.responses.set('k', 'get_travel_tips', 'model', 'tips', ttl=600)
+        cache.clear()
+        self.assertEqual(self.responses.get('k'), 'tips')
+        self.assertEqual(self.responses.peek('k'), 'tips')  # Put back in Django's cache
+        self.assertEqual(AIResponse.objects.get(key='k').hits, 1)
+
+    def test_expired_entries_are_not_served(self):
+        self.responses.set('k', 'get_travel_tips', 'model', 'tips', ttl=600)
+        cache.clear()
+        AIResponse.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(self.responses.get('k'))
+
+    def test_django_cache_hits_are_recorded_once_a_minute(self):
+        self.responses.set('k', 'get_travel_tips', 'model', 'tips', ttl=600)
+        AIResponse.objects.update(last_used_at=timezone.now() - timedelta(hours=1))
+        for _ in range(3):
+            self.assertEqual(self.responses.get('k'), 'tips')
+        entry = AIResponse.objects.get(key='k')
+        self.assertEqual(entry.hits, 1)
+        self.assertGreater(entry.last_used_at, timezone.now() - timedelta(minutes=1))
+
+    @override_settings(AI_CACHE_MAX_ENTRIES=2)
+    def test_evicts_least_recently_used(self):
+        self.responses.set('hot', 'get_travel_tips', 'model', 'hot', ttl=600)
+        self.responses.set('cold', 'get_travel_tips', 'model', 'cold', ttl=600)
+        AIResponse.objects.update(last_used_at=timezone.now() - timedelta(hours=1))
+        # A hit served by Django's cache still marks the entry as recently used
+        self.responses.get('hot')
+        self.responses.set('new', 'get_travel_tips', 'model', 'new', ttl=600)
+        self.assertEqual(set(AIResponse.objects.values_list('key', flat=True)), {'hot', 'new'})
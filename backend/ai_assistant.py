@@ -1,36 +1,580 @@
 """
 AI Assistant service using Groq API for travel recommendations and planning.
 """
-from groq import Groq
+import asyncio
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+
+from ai.governor import RateGovernor, RateLimitExceeded
+from ai.models import AIResponse
+from circuit_breaker import get_breaker
+from deadlines import DeadlineExceeded, remaining, timeout_for
+from itineraries.parsing import parse_day_plans
+
+
+logger = logging.getLogger(__name__)
+
+# Public assistant methods that make completions, reported by check_groq_status()
+ROUTED_METHODS = (
+    'get_destination_recommendations',
+    'generate_itinerary_plan',
+    'enhance_destination_description',
+    'get_travel_tips',
+    'answer_travel_question',
+)
+
+
+def _is_outage(error):
+    """Whether a Groq error means the service, not this request, is failing."""
+    if isinstance(error, (RateLimitExceeded, DeadlineExceeded)):
+        return False
+    status = getattr(error, 'status_code', None)
+    return status is None or status >= 500
+
+
+def itinerary_days_error(days):
+    """
+    Check a requested itinerary length.
+
+    Returns:
+        str: An error message if days is outside 1..AI_ITINERARY_MAX_DAYS, else None
+    """
+    if not 1 <= days <= settings.AI_ITINERARY_MAX_DAYS:
+        return f'Please enter between 1 and {settings.AI_ITINERARY_MAX_DAYS} days.'
+    return None
+
+
+def _day_ranges(days, chunk_days):
+    """Split days 1..days into consecutive (first_day, last_day) ranges of chunk_days."""
+    return [(first, min(first + chunk_days - 1, days)) for first in range(1, days + 1, chunk_days)]
+
+
+def _missing_ranges(day_numbers, first_day, last_day):
+    """Group the days of first_day..last_day absent from day_numbers into contiguous ranges."""
+    ranges = []
+    for day in range(first_day, last_day + 1):
+        if day in day_numbers:
+            continue
+        if ranges and ranges[-1][1] == day - 1:
+            ranges[-1] = (ranges[-1][0], day)
+        else:
+            ranges.append((day, day))
+    return ranges
+
+
+class IncompleteItinerary(Exception):
+    """Raised when generated itinerary text still lacks some of the requested days"""
+
+    def __init__(self, missing):
+        self.missing = missing
+        super().__init__(
+            f"The itinerary came back without day(s) {', '.join(map(str, missing))}. Please try again."
+        )
+
+
+def _check_complete(plans, days):
+    """Raise IncompleteItinerary unless {day_number: plan} covers days 1..days."""
+    missing = [day for day in range(1, days + 1) if day not in plans]
+    if missing:
+        raise IncompleteItinerary(missing)
+
+
+def _format_days(plans):
+    """Render {day_number: plan} in the DAY N: format the itinerary prompt asks for."""
+    return '\n\n'.join(f'DAY {day}:\n{plan}' for day, plan in sorted(plans.items()))
+
+
+def _normalize(value):
+    """Normalize a prompt input so trivially different requests share a cache entry."""
+    if isinstance(value, str):
+        return ' '.join(value.split()).lower()
+    return value
+
+
+class AIResponseCache:
+    """
+    Two-level cache for AI completions.
+
+    Django's cache answers repeat requests without touching the database; the
+    AIResponse table keeps entries across restarts and cache evictions. The
+    table is bounded by AI_CACHE_MAX_ENTRIES, evicting expired entries first
+    and then the least recently used ones. Hits served by Django's cache bump
+    the row's last_used_at and hits too, at most once per TOUCH_INTERVAL
+    seconds per key, so the hottest entries aren't the first evicted.
+    """
+    TOUCH_INTERVAL = 60
+
+    def make_key(self, method, inputs, model_name, temperature):
+        """
+        Build the cache key for one completion request.
+
+        Args:
+            method: Assistant method name
+            inputs: Tuple of the method's prompt inputs
+            model_name: Groq model used
+            temperature: Sampling temperature
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        payload = json.dumps([method, [_normalize(value) for value in inputs], model_name, temperature])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def peek(self, key):
+        """Return the completion for a key from Django's cache only, or None."""
+        return cache.get(f'ai:response:{key}')
+
+    async def apeek(self, key):
+        """Async version of peek()"""
+        return await cache.aget(f'ai:response:{key}')
+
+    def _touch(self, key):
+        """Record a Django cache hit in the table, throttled per key."""
+        if cache.add(f'ai:touched:{key}', True, timeout=self.TOUCH_INTERVAL):
+            AIResponse.objects.filter(key=key).update(hits=F('hits') + 1, last_used_at=timezone.now())
+
+    def get(self, key):
+        """Return the cached completion for a key, or None."""
+        content = cache.get(f'ai:response:{key}')
+        if content is not None:
+            self._touch(key)
+            return content
+
+        now = timezone.now()
+        entry = AIResponse.objects.filter(key=key, expires_at__gt=now).only('content', 'expires_at').first()
+        if entry is None:
+            return None
+        AIResponse.objects.filter(pk=entry.pk).update(hits=F('hits') + 1, last_used_at=now)
+        cache.set(f'ai:response:{key}', entry.content, timeout=(entry.expires_at - now).total_seconds())
+        return entry.content
+
+    def set(self, key, method, model_name, content, ttl):
+        """Store a completion in both levels and apply the eviction policy."""
+        now = timezone.now()
+        cache.set(f'ai:response:{key}', content, timeout=ttl)
+        AIResponse.objects.update_or_create(
+            key=key,
+            defaults={
+                'method': method,
+                'model_name': model_name,
+                'content': content,
+                'last_used_at': now,
+                'expires_at': now + timedelta(seconds=ttl),
+            },
+        )
+        self.evict()
+
+    def evict(self):
+        """Drop expired entries, then the least recently used beyond the size cap."""
+        AIResponse.objects.filter(expires_at__lte=timezone.now()).delete()
+        overflow = list(
+            AIResponse.objects.order_by('-last_used_at')
+            .values_list('pk', flat=True)[settings.AI_CACHE_MAX_ENTRIES:]
+        )
+        if overflow:
+            AIResponse.objects.filter(pk__in=overflow).delete()
+
+
+class _Flight:
+    """One in-flight completion that other callers in this process can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical completions into one upstream call.
+
+    Within a process, callers asking for a key that is already being computed
+    wait for the leader's result instead of starting their own call. Across
+    gunicorn workers, the leader holds an `ai:inflight:<key>` lock in Django's
+    cache (shared when CACHE_BACKEND is Redis or Memcached); workers that find
+    the lock taken poll the response cache until the leader's answer lands
+    there, and only call upstream themselves if the leader gives up or the
+    lock times out.
+    """
+
+    def __init__(self, cache, lock_timeout=60, poll_interval=0.2):
+        """
+        Args:
+            cache: AIResponseCache the leader stores its answer in
+            lock_timeout: Seconds before a cross-process lock is considered abandoned
+            poll_interval: Seconds between response cache checks while waiting
+        """
+        self.cache = cache
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self._flights = {}
+        self._async_flights = {}
+        self._lock = threading.Lock()
+
+    def _wait_limit(self):
+        """Seconds to wait for another worker's answer; never past the request deadline."""
+        left = remaining()
+        return self.lock_timeout if left is None else min(self.lock_timeout, left)
+
+    def do(self, key, fetch):
+        """
+        Return fetch()'s result, sharing one call among concurrent callers.
+
+        Args:
+            key: Response cache key of the completion
+            fetch: Zero-argument callable that calls upstream and caches the answer
+
+        Returns:
+            str: Completion text
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = self._do_shared(key, fetch)
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _do_shared(self, key, fetch):
+        """Run fetch() under the cross-process lock, or wait for the worker holding it."""
+        lock_key = f'ai:inflight:{key}'
+        deadline = time.monotonic() + self._wait_limit()
+        while not cache.add(lock_key, True, timeout=self.lock_timeout):
+            content = self.cache.peek(key)
+            if content is not None:
+                return content
+            if time.monotonic() >= deadline:
+                return fetch()
+            time.sleep(self.poll_interval)
+
+        try:
+            # The previous holder may have stored the answer just before we got the lock
+            content = self.cache.peek(key)
+            return content if content is not None else fetch()
+        finally:
+            cache.delete(lock_key)
+
+    async def ado(self, key, fetch):
+        """
+        Async version of do().
+
+        Args:
+            key: Response cache key of the completion
+            fetch: Zero-argument coroutine function that calls upstream and caches the answer
+
+        Returns:
+            str: Completion text
+        """
+        flight = self._async_flights.get(key)
+        if flight is None or flight.get_loop() is not asyncio.get_running_loop():
+            flight = asyncio.ensure_future(self._ado_shared(key, fetch))
+            self._async_flights[key] = flight
+            flight.add_done_callback(
+                lambda done: self._async_flights.pop(key) if self._async_flights.get(key) is done else None
+            )
+        # shield() keeps one disconnecting client from cancelling everyone's call
+        return await asyncio.shield(flight)
+
+    async def _ado_shared(self, key, fetch):
+        """Async version of _do_shared()"""
+        lock_key = f'ai:inflight:{key}'
+        deadline = time.monotonic() + self._wait_limit()
+        while not await cache.aadd(lock_key, True, timeout=self.lock_timeout):
+            content = await self.cache.apeek(key)
+            if content is not None:
+                return content
+            if time.monotonic() >= deadline:
+                return await fetch()
+            await asyncio.sleep(self.poll_interval)
+
+        try:
+            content = await self.cache.apeek(key)
+            return content if content is not None else await fetch()
+        finally:
+            await cache.adelete(lock_key)
 
 
 class TravelAIAssistant:
     """AI Assistant for travel planning using Groq"""
     
-    def __init__(self, model_name='llama-3.3-70b-versatile'):
+    def __init__(self, model_name=None):
         """
         Initialize the AI assistant with Groq.
         
         Args:
-            model_name: Name of the Groq model to use (default: llama-3.3-70b-versatile)
+            model_name: Groq model for methods without an AI_MODEL_ROUTES
+                        entry (default: AI_DEFAULT_MODEL)
         """
-        self.model_name = model_name
-        # Initialize Groq client
-        self.client = Groq(api_key=settings.GROQ_API_KEY)
-        
-    def get_destination_recommendations(self, user_query):
+        self.model_name = model_name or settings.AI_DEFAULT_MODEL
+        # Groq clients are built on first use (see the client properties), so
+        # importing this module doesn't load the SDK for migrate, collectstatic
+        # or worker boot
+        self._client = None
+        self._async_client = None
+        self._client_lock = threading.Lock()
+        self.cache = AIResponseCache()
+        # Paces every upstream call to the Groq quota, shared across workers
+        self.governor = RateGovernor.from_settings()
+        self.flights = SingleFlight(
+            self.cache,
+            lock_timeout=settings.AI_SINGLE_FLIGHT_TIMEOUT,
+            poll_interval=settings.AI_SINGLE_FLIGHT_POLL_INTERVAL,
+        )
+
+    @property
+    def client(self):
+        """Groq client, created (and the SDK imported) on first use"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from groq import Groq
+                    self._client = Groq(
+                        api_key=settings.GROQ_API_KEY,
+                        timeout=settings.AI_REQUEST_TIMEOUT,
+                        max_retries=settings.AI_REQUEST_MAX_RETRIES,
+                    )
+        return self._client
+
+    @property
+    def async_client(self):
+        """AsyncGroq client for the ASGI views, created on first use"""
+        if self._async_client is None:
+            with self._client_lock:
+                if self._async_client is None:
+                    from groq import AsyncGroq
+                    self._async_client = AsyncGroq(
+                        api_key=settings.GROQ_API_KEY,
+                        timeout=settings.AI_REQUEST_TIMEOUT,
+                        max_retries=settings.AI_REQUEST_MAX_RETRIES,
+                    )
+        return self._async_client
+
+    @staticmethod
+    def _bounded(client):
         """
-        Get destination recommendations based on user query.
-        
+        Return `client` limited to the time left before the request deadline.
+
+        Raises:
+            DeadlineExceeded: Too little time is left to start a call
+        """
+        if remaining() is None:
+            return client
+        # SDK retries would overrun the budget; the model fallback is the retry
+        return client.with_options(timeout=timeout_for(settings.AI_REQUEST_TIMEOUT), max_retries=0)
+
+    def model_for(self, method):
+        """Return the Groq model an assistant method is routed to (see AI_MODEL_ROUTES)."""
+        return settings.AI_MODEL_ROUTES.get(method, self.model_name)
+
+    @staticmethod
+    def _candidates(model):
+        """The routed model followed by its fallback, if one is configured."""
+        fallback = settings.AI_MODEL_FALLBACKS.get(model)
+        return [model, fallback] if fallback and fallback != model else [model]
+
+    def _complete(self, method, inputs, prompt, max_tokens, temperature=0.7, use_cache=True):
+        """
+        Run one chat completion, answering from the response cache when possible.
+
+        Concurrent cached calls for the same key are coalesced into a single
+        upstream request (see SingleFlight).
+
         Args:
-            user_query: User's travel preferences or query
-            
+            method: Name of the calling assistant method (selects the model and cache TTL)
+            inputs: Tuple of the prompt inputs, used for the cache key
+            prompt: Full prompt text
+            max_tokens: Completion token limit
+            temperature: Sampling temperature
+            use_cache: Set to False to bypass the cache and force a fresh completion
+
         Returns:
-            dict: AI recommendations with destinations and reasons
+            str: Completion text
         """
-        try:
-            prompt = f"""You are a travel expert assistant. A user wants travel recommendations.
+        use_cache = use_cache and settings.AI_CACHE_ENABLED
+        model = self.model_for(method)
+        key = self.cache.make_key(method, inputs, model, temperature)
+        if not use_cache:
+            return self._create(model, prompt, max_tokens, temperature)[0]
+
+        content = self.cache.get(key)
+        if content is not None:
+            return content
+
+        def fetch():
+            content, used_model = self._create(model, prompt, max_tokens, temperature)
+            ttl = settings.AI_CACHE_TTLS.get(method, settings.AI_CACHE_DEFAULT_TTL)
+            self.cache.set(key, method, used_model, content, ttl)
+            return content
+
+        return self.flights.do(key, fetch)
+
+    def _create(self, model, prompt, max_tokens, temperature, stream=False):
+        """
+        Call the Groq chat completions API, falling back to the other model on error.
+
+        Each model has its own circuit breaker; while it is open the model is
+        skipped without waiting for a timeout.
+
+        Returns:
+            tuple: (answer text, or the stream when stream=True; model that answered)
+        """
+        candidates = self._candidates(model)
+        for i, candidate in enumerate(candidates):
+            try:
+                response = get_breaker(f'groq:{candidate}').call(
+                    lambda: self.governor.call(
+                        lambda: self._bounded(self.client).chat.completions.create(
+                            model=candidate,
+                            messages=[{"role": "user", "content": prompt}],
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stream=stream
+                        ),
+                        self.governor.estimate(prompt, max_tokens)
+                    ),
+                    is_failure=_is_outage
+                )
+            except (RateLimitExceeded, DeadlineExceeded):
+                # Both models share the governor's budget and the deadline; switching won't help
+                raise
+            except Exception:
+                if i == len(candidates) - 1:
+                    raise
+                logger.warning('Groq model %s failed, falling back to %s', candidate, candidates[i + 1], exc_info=True)
+                continue
+            return (response if stream else response.choices[0].message.content), candidate
+
+    def _stream(self, method, inputs, prompt, max_tokens, temperature=0.7, use_cache=True):
+        """
+        Streaming counterpart of _complete(), yielding text chunks as they arrive.
+
+        A cached answer is yielded as a single chunk; a streamed answer is
+        cached once it has completed. Fallback only applies to opening the
+        stream, not to a stream that breaks part-way.
+        """
+        use_cache = use_cache and settings.AI_CACHE_ENABLED
+        model = self.model_for(method)
+        key = self.cache.make_key(method, inputs, model, temperature)
+        if use_cache:
+            content = self.cache.get(key)
+            if content is not None:
+                yield content
+                return
+
+        stream, used_model = self._create(model, prompt, max_tokens, temperature, stream=True)
+        parts = []
+        for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                yield text
+
+        if use_cache:
+            ttl = settings.AI_CACHE_TTLS.get(method, settings.AI_CACHE_DEFAULT_TTL)
+            self.cache.set(key, method, used_model, ''.join(parts), ttl)
+
+    async def _acomplete(self, method, inputs, prompt, max_tokens, temperature=0.7, use_cache=True):
+        """Async counterpart of _complete() using the async Groq client."""
+        use_cache = use_cache and settings.AI_CACHE_ENABLED
+        model = self.model_for(method)
+        key = self.cache.make_key(method, inputs, model, temperature)
+        if not use_cache:
+            return (await self._acreate(model, prompt, max_tokens, temperature))[0]
+
+        content = await sync_to_async(self.cache.get)(key)
+        if content is not None:
+            return content
+
+        async def fetch():
+            content, used_model = await self._acreate(model, prompt, max_tokens, temperature)
+            ttl = settings.AI_CACHE_TTLS.get(method, settings.AI_CACHE_DEFAULT_TTL)
+            await sync_to_async(self.cache.set)(key, method, used_model, content, ttl)
+            return content
+
+        return await self.flights.ado(key, fetch)
+
+    async def _acreate(self, model, prompt, max_tokens, temperature, stream=False):
+        """Async version of _create()"""
+        candidates = self._candidates(model)
+        for i, candidate in enumerate(candidates):
+            try:
+                response = await get_breaker(f'groq:{candidate}').acall(
+                    lambda: self.governor.acall(
+                        lambda: self._bounded(self.async_client).chat.completions.create(
+                            model=candidate,
+                            messages=[{"role": "user", "content": prompt}],
+                            temperature=temperature,
+                            max_tokens=max_tokens,
+                            stream=stream
+                        ),
+                        self.governor.estimate(prompt, max_tokens)
+                    ),
+                    is_failure=_is_outage
+                )
+            except (RateLimitExceeded, DeadlineExceeded):
+                raise
+            except Exception:
+                if i == len(candidates) - 1:
+                    raise
+                logger.warning('Groq model %s failed, falling back to %s', candidate, candidates[i + 1], exc_info=True)
+                continue
+            return (response if stream else response.choices[0].message.content), candidate
+
+    async def _astream(self, method, inputs, prompt, max_tokens, temperature=0.7, use_cache=True):
+        """Async counterpart of _stream() using the async Groq client."""
+        use_cache = use_cache and settings.AI_CACHE_ENABLED
+        model = self.model_for(method)
+        key = self.cache.make_key(method, inputs, model, temperature)
+        if use_cache:
+            content = await sync_to_async(self.cache.get)(key)
+            if content is not None:
+                yield content
+                return
+
+        stream, used_model = await self._acreate(model, prompt, max_tokens, temperature, stream=True)
+        parts = []
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                parts.append(text)
+                yield text
+
+        if use_cache:
+            ttl = settings.AI_CACHE_TTLS.get(method, settings.AI_CACHE_DEFAULT_TTL)
+            await sync_to_async(self.cache.set)(key, method, used_model, ''.join(parts), ttl)
+
+    @staticmethod
+    def _recommendations_prompt(user_query):
+        """Build the destination recommendations prompt."""
+        return f"""You are a travel expert assistant. A user wants travel recommendations.
 
 User Query: {user_query}
 
@@ -43,16 +587,28 @@ BUDGET: [Rough budget range in INR]
 
 Keep each recommendation concise and focused."""
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1024
+    def get_destination_recommendations(self, user_query, use_cache=True):
+        """
+        Get destination recommendations based on user query.
+        
+        Args:
+            user_query: User's travel preferences or query
+            use_cache: Set to False to bypass the response cache
+            
+        Returns:
+            dict: AI recommendations with destinations and reasons
+        """
+        try:
+            prompt = self._recommendations_prompt(user_query)
+
+            content = self._complete(
+                'get_destination_recommendations', (user_query,), prompt,
+                max_tokens=1024, use_cache=use_cache
             )
             
             return {
                 'success': True,
-                'recommendations': response.choices[0].message.content,
+                'recommendations': content,
                 'query': user_query
             }
             
@@ -63,20 +619,10 @@ Keep each recommendation concise and focused."""
                 'recommendations': None
             }
     
-    def generate_itinerary_plan(self, destination, days, interests):
-        """
-        Generate a detailed day-by-day itinerary plan.
-        
-        Args:
-            destination: Destination name
-            days: Number of days
-            interests: User interests/preferences
-            
-        Returns:
-            dict: Day-wise itinerary suggestions
-        """
-        try:
-            prompt = f"""You are a travel planning expert. Create a detailed {days}-day itinerary for {destination}.
+    @staticmethod
+    def _itinerary_prompt(destination, days, interests):
+        """Build the itinerary planning prompt."""
+        return f"""You are a travel planning expert. Create a detailed {days}-day itinerary for {destination}.
 
 User Interests: {interests}
 
@@ -97,20 +643,210 @@ DAY 2:
 
 Be specific and practical."""
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=2048
+    @staticmethod
+    def _itinerary_chunk_prompt(destination, days, interests, first_day, last_day):
+        """Build the prompt for one day range of a long itinerary."""
+        if first_day == 1:
+            before = "Day 1 is the arrival day."
+        else:
+            before = (f"Days 1 to {first_day - 1} are planned separately; don't repeat the "
+                      f"main sights a visitor would see first.")
+        if last_day == days:
+            after = f"Day {days} is the departure day."
+        else:
+            after = f"Days {last_day + 1} to {days} are planned separately; leave some sights for them."
+
+        return f"""You are a travel planning expert. You are writing part of a detailed {days}-day itinerary for {destination}.
+
+User Interests: {interests}
+
+Write ONLY days {first_day} to {last_day}. {before} {after}
+
+For each day include:
+- Morning, afternoon, and evening activities
+- Must-visit attractions
+- Local food recommendations
+
+Format as:
+DAY {first_day}:
+Morning: [Activity]
+Afternoon: [Activity]
+Evening: [Activity]
+
+DAY {first_day + 1}:
+[Continue until DAY {last_day}]
+
+Be specific and practical."""
+
+    @staticmethod
+    def _chunk_max_tokens(first_day, last_day):
+        """Token limit for a day range, sized so the last day isn't cut off."""
+        return min(2048, 300 * (last_day - first_day + 1) + 200)
+
+    def _itinerary_days(self, destination, days, interests, first_day, last_day, use_cache=True):
+        """
+        Generate days first_day..last_day of a chunked itinerary.
+
+        Days the model skipped or cut off are requested once more on their own.
+
+        Returns:
+            dict: day_number -> plan for the days that were generated
+        """
+        plans = {}
+        ranges = [(first_day, last_day)]
+        for attempt in range(2):
+            for first, last in ranges:
+                content = self._complete(
+                    'generate_itinerary_plan', (destination, days, interests, first, last),
+                    self._itinerary_chunk_prompt(destination, days, interests, first, last),
+                    max_tokens=self._chunk_max_tokens(first, last),
+                    use_cache=use_cache and attempt == 0
+                )
+                for day, plan in parse_day_plans(content):
+                    if first <= day <= last:
+                        plans.setdefault(day, plan)
+            ranges = _missing_ranges(plans, first_day, last_day)
+            if not ranges:
+                break
+        return plans
+
+    def _itinerary_days_in_thread(self, *args, **kwargs):
+        """_itinerary_days() for the chunk pool; closes the thread's DB connections."""
+        try:
+            return self._itinerary_days(*args, **kwargs)
+        finally:
+            connections.close_all()
+
+    def _submit_chunks(self, executor, destination, days, interests, use_cache):
+        """Start every day range of a long itinerary on the pool, in day order."""
+        # Each range runs in a copy of this context so it keeps the request deadline
+        return [
+            executor.submit(
+                contextvars.copy_context().run,
+                self._itinerary_days_in_thread, destination, days, interests, first, last, use_cache
             )
+            for first, last in _day_ranges(days, settings.AI_ITINERARY_CHUNK_DAYS)
+        ]
+
+    def _chunk_executor(self, days):
+        """Thread pool for one chunked itinerary."""
+        workers = min(len(_day_ranges(days, settings.AI_ITINERARY_CHUNK_DAYS)), settings.AI_ITINERARY_MAX_PARALLEL)
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='itinerary')
+
+    def _generate_chunked(self, destination, days, interests, use_cache=True):
+        """
+        Generate a long itinerary as concurrent day ranges and stitch them in order.
+
+        Wall-clock time is about that of one range, and each range is small
+        enough to finish within its token limit. The first failing range
+        cancels the ranges that haven't started.
+        """
+        executor = self._chunk_executor(days)
+        try:
+            futures = self._submit_chunks(executor, destination, days, interests, use_cache)
+            plans = {}
+            for future in futures:
+                plans.update(future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        _check_complete(plans, days)
+        return _format_days(plans)
+
+    def stream_itinerary_plan(self, destination, days, interests, use_cache=True):
+        """
+        Generate an itinerary plan, yielding the text as it is produced.
+
+        Args:
+            destination: Destination name
+            days: Number of days
+            interests: User interests/preferences
+            use_cache: Set to False to bypass the response cache
+
+        Yields:
+            str: Successive chunks of the itinerary text
+
+        Raises:
+            ValueError: days is outside 1..AI_ITINERARY_MAX_DAYS
+        """
+        error = itinerary_days_error(days)
+        if error:
+            raise ValueError(error)
+        if days > settings.AI_ITINERARY_CHUNK_DAYS:
+            # All day ranges generate at once; each is sent as soon as it and
+            # the ones before it are done. A failure or a closed stream cancels
+            # the ranges that haven't started.
+            executor = self._chunk_executor(days)
+            plans = {}
+            try:
+                futures = self._submit_chunks(executor, destination, days, interests, use_cache)
+                for i, future in enumerate(futures):
+                    day_plans = future.result()
+                    plans.update(day_plans)
+                    yield ('\n\n' if i else '') + _format_days(day_plans)
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            _check_complete(plans, days)
+            return
+
+        empty = True
+        for text in self._stream(
+            'generate_itinerary_plan', (destination, days, interests),
+            self._itinerary_prompt(destination, days, interests),
+            max_tokens=2048, use_cache=use_cache
+        ):
+            empty = empty and not text.strip()
+            yield text
+        if empty:
+            raise IncompleteItinerary(list(range(1, days + 1)))
+
+    def generate_itinerary_plan(self, destination, days, interests, use_cache=True):
+        """
+        Generate a detailed day-by-day itinerary plan.
+        
+        Args:
+            destination: Destination name
+            days: Number of days
+            interests: User interests/preferences
+            use_cache: Set to False to bypass the response cache
+            
+        Trips longer than AI_ITINERARY_CHUNK_DAYS are generated as concurrent
+        day ranges and stitched together (see _generate_chunked()). A chunked
+        plan still missing days after the retry, or an empty answer, is an
+        error with the 'missing_days' listed.
+
+        Returns:
+            dict: Day-wise itinerary suggestions
+        """
+        error = itinerary_days_error(days)
+        if error:
+            return {'success': False, 'error': error, 'itinerary': None}
+        try:
+            if days > settings.AI_ITINERARY_CHUNK_DAYS:
+                content = self._generate_chunked(destination, days, interests, use_cache=use_cache)
+            else:
+                prompt = self._itinerary_prompt(destination, days, interests)
+
+                content = self._complete(
+                    'generate_itinerary_plan', (destination, days, interests), prompt,
+                    max_tokens=2048, use_cache=use_cache
+                )
+                if not content.strip():
+                    raise IncompleteItinerary(list(range(1, days + 1)))
             
             return {
                 'success': True,
-                'itinerary': response.choices[0].message.content,
+                'itinerary': content,
                 'destination': destination,
                 'days': days
             }
             
+        except IncompleteItinerary as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'itinerary': None,
+                'missing_days': e.missing
+            }
         except Exception as e:
             return {
                 'success': False,
@@ -118,13 +854,14 @@ Be specific and practical."""
                 'itinerary': None
             }
     
-    def enhance_destination_description(self, destination_name, current_description):
+    def enhance_destination_description(self, destination_name, current_description, use_cache=True):
         """
         Enhance destination description with AI-generated insights.
         
         Args:
             destination_name: Name of the destination
             current_description: Current description
+            use_cache: Set to False to bypass the response cache
             
         Returns:
             dict: Enhanced description
@@ -137,16 +874,14 @@ Current Description: {current_description}
 
 Add 2-3 unique insights or travel tips that tourists should know. Keep it under 100 words."""
 
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=512
+            content = self._complete(
+                'enhance_destination_description', (destination_name, current_description), prompt,
+                max_tokens=512, use_cache=use_cache
             )
             
             return {
                 'success': True,
-                'enhanced_description': response.choices[0].message.content
+                'enhanced_description': content
             }
             
         except Exception as e:
@@ -156,39 +891,43 @@ Add 2-3 unique insights or travel tips that tourists should know. Keep it under
                 'enhanced_description': None
             }
     
-    def get_travel_tips(self, destination, season):
+    @staticmethod
+    def _travel_tips_prompt(destination, season):
+        """Build the travel tips prompt."""
+        return f"""You are a travel advisor. Provide 5 practical travel tips for visiting {destination} during {season}.
+
+Include tips about:
+- What to pack
+- Local customs
+- Safety considerations
+- Money-saving advice
+- Must-try experiences
+
+Keep each tip brief and actionable."""
+
+    def get_travel_tips(self, destination, season, use_cache=True):
         """
         Get AI-generated travel tips for a destination.
         
         Args:
             destination: Destination name
             season: Travel season
+            use_cache: Set to False to bypass the response cache
             
         Returns:
             dict: Travel tips and advice
         """
         try:
-            prompt = f"""You are a travel advisor. Provide 5 practical travel tips for visiting {destination} during {season}.
-
-Include tips about:
-- What to pack
-- Local customs
-- Safety considerations
-- Money-saving advice
-- Must-try experiences
+            prompt = self._travel_tips_prompt(destination, season)
 
-Keep each tip brief and actionable."""
-
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1024
+            content = self._complete(
+                'get_travel_tips', (destination, season), prompt,
+                max_tokens=1024, use_cache=use_cache
             )
             
             return {
                 'success': True,
-                'tips': response.choices[0].message.content,
+                'tips': content,
                 'destination': destination
             }
             
@@ -199,36 +938,39 @@ Keep each tip brief and actionable."""
                 'tips': None
             }
     
-    def answer_travel_question(self, question, context=''):
+    @staticmethod
+    def _question_prompt(question, context):
+        """Build the travel question prompt."""
+        context_text = f"\nContext: {context}" if context else ""
+        return f"""You are a helpful travel assistant. Answer this travel question clearly and concisely.
+
+Question: {question}{context_text}
+
+Provide a helpful, accurate response in 2-3 paragraphs."""
+
+    def answer_travel_question(self, question, context='', use_cache=True):
         """
         Answer general travel-related questions.
         
         Args:
             question: User's question
             context: Optional context (e.g., specific destination)
+            use_cache: Set to False to bypass the response cache
             
         Returns:
             dict: AI-generated answer
         """
         try:
-            context_text = f"\nContext: {context}" if context else ""
-            
-            prompt = f"""You are a helpful travel assistant. Answer this travel question clearly and concisely.
+            prompt = self._question_prompt(question, context)
 
-Question: {question}{context_text}
-
-Provide a helpful, accurate response in 2-3 paragraphs."""
-
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=1024
+            content = self._complete(
+                'answer_travel_question', (question, context), prompt,
+                max_tokens=1024, use_cache=use_cache
             )
             
             return {
                 'success': True,
-                'answer': response.choices[0].message.content,
+                'answer': content,
                 'question': question
             }
             
@@ -239,6 +981,168 @@ Provide a helpful, accurate response in 2-3 paragraphs."""
                 'answer': None
             }
     
+    # Async variants used by the ASGI views. They return the same dicts as
+    # their sync counterparts.
+
+    async def aget_destination_recommendations(self, user_query, use_cache=True):
+        """Async version of get_destination_recommendations()"""
+        try:
+            content = await self._acomplete(
+                'get_destination_recommendations', (user_query,), self._recommendations_prompt(user_query),
+                max_tokens=1024, use_cache=use_cache
+            )
+            return {
+                'success': True,
+                'recommendations': content,
+                'query': user_query
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'AI service error: {str(e)}',
+                'recommendations': None
+            }
+
+    async def _aitinerary_days(self, destination, days, interests, first_day, last_day, use_cache=True):
+        """Async version of _itinerary_days()"""
+        plans = {}
+        ranges = [(first_day, last_day)]
+        for attempt in range(2):
+            for first, last in ranges:
+                content = await self._acomplete(
+                    'generate_itinerary_plan', (destination, days, interests, first, last),
+                    self._itinerary_chunk_prompt(destination, days, interests, first, last),
+                    max_tokens=self._chunk_max_tokens(first, last),
+                    use_cache=use_cache and attempt == 0
+                )
+                for day, plan in parse_day_plans(content):
+                    if first <= day <= last:
+                        plans.setdefault(day, plan)
+            ranges = _missing_ranges(plans, first_day, last_day)
+            if not ranges:
+                break
+        return plans
+
+    def _start_achunks(self, destination, days, interests, use_cache):
+        """Async version of _submit_chunks(); returns tasks in day order."""
+        return [
+            asyncio.ensure_future(self._aitinerary_days(destination, days, interests, first, last, use_cache))
+            for first, last in _day_ranges(days, settings.AI_ITINERARY_CHUNK_DAYS)
+        ]
+
+    async def agenerate_itinerary_plan(self, destination, days, interests, use_cache=True):
+        """Async version of generate_itinerary_plan()"""
+        error = itinerary_days_error(days)
+        if error:
+            return {'success': False, 'error': error, 'itinerary': None}
+        try:
+            if days > settings.AI_ITINERARY_CHUNK_DAYS:
+                plans = {}
+                tasks = self._start_achunks(destination, days, interests, use_cache)
+                try:
+                    for task in tasks:
+                        plans.update(await task)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                _check_complete(plans, days)
+                content = _format_days(plans)
+            else:
+                content = await self._acomplete(
+                    'generate_itinerary_plan', (destination, days, interests),
+                    self._itinerary_prompt(destination, days, interests),
+                    max_tokens=2048, use_cache=use_cache
+                )
+                if not content.strip():
+                    raise IncompleteItinerary(list(range(1, days + 1)))
+            return {
+                'success': True,
+                'itinerary': content,
+                'destination': destination,
+                'days': days
+            }
+        except IncompleteItinerary as e:
+            return {
+                'success': False,
+                'error': str(e),
+                'itinerary': None,
+                'missing_days': e.missing
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'AI service error: {str(e)}',
+                'itinerary': None
+            }
+
+    async def astream_itinerary_plan(self, destination, days, interests, use_cache=True):
+        """Async version of stream_itinerary_plan()"""
+        error = itinerary_days_error(days)
+        if error:
+            raise ValueError(error)
+        if days > settings.AI_ITINERARY_CHUNK_DAYS:
+            tasks = self._start_achunks(destination, days, interests, use_cache)
+            plans = {}
+            try:
+                for i, task in enumerate(tasks):
+                    day_plans = await task
+                    plans.update(day_plans)
+                    yield ('\n\n' if i else '') + _format_days(day_plans)
+            finally:
+                for task in tasks:
+                    task.cancel()
+            _check_complete(plans, days)
+            return
+
+        empty = True
+        async for text in self._astream(
+            'generate_itinerary_plan', (destination, days, interests),
+            self._itinerary_prompt(destination, days, interests),
+            max_tokens=2048, use_cache=use_cache
+        ):
+            empty = empty and not text.strip()
+            yield text
+        if empty:
+            raise IncompleteItinerary(list(range(1, days + 1)))
+
+    async def aget_travel_tips(self, destination, season, use_cache=True):
+        """Async version of get_travel_tips()"""
+        try:
+            content = await self._acomplete(
+                'get_travel_tips', (destination, season), self._travel_tips_prompt(destination, season),
+                max_tokens=1024, use_cache=use_cache
+            )
+            return {
+                'success': True,
+                'tips': content,
+                'destination': destination
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'AI service error: {str(e)}',
+                'tips': None
+            }
+
+    async def aanswer_travel_question(self, question, context='', use_cache=True):
+        """Async version of answer_travel_question()"""
+        try:
+            content = await self._acomplete(
+                'answer_travel_question', (question, context), self._question_prompt(question, context),
+                max_tokens=1024, use_cache=use_cache
+            )
+            return {
+                'success': True,
+                'answer': content,
+                'question': question
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f'AI service error: {str(e)}',
+                'answer': None
+            }
+
     @staticmethod
     def check_groq_status():
         """
@@ -250,9 +1154,15 @@ Provide a helpful, accurate response in 2-3 paragraphs."""
         try:
             api_key = settings.GROQ_API_KEY
             if api_key and api_key != '':
+                routes = {
+                    method: settings.AI_MODEL_ROUTES.get(method, settings.AI_DEFAULT_MODEL)
+                    for method in ROUTED_METHODS
+                }
                 return {
                     'available': True,
-                    'models': ['llama-3.3-70b-versatile'],
+                    'models': sorted({settings.AI_DEFAULT_MODEL, *routes.values(),
+                                      *settings.AI_MODEL_FALLBACKS.values()}),
+                    'routes': routes,
                     'message': 'Groq API is configured'
                 }
             else:
@@ -1,10 +1,20 @@
 """
 AI-powered views for travel recommendations and planning.
 """
-from django.shortcuts import render
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from ai_assistant import ai_assistant
+from django.views.decorators.http import require_GET
+from ai.insights import get_destination_tips, get_insight, save_insight, schedule_refresh
+from ai.jobs import enqueue_job
+from ai.models import AIJob
+from ai_assistant import ai_assistant, itinerary_days_error
 from destinations.models import Destination
 
 
@@ -38,52 +48,134 @@ def ai_travel_assistant(request):
     return render(request, 'ai/ai_assistant.html', context)
 
 
+def _itinerary_params(params):
+    """
+    Validate itinerary form or query parameters.
+
+    Returns:
+        tuple: (destination, days, interests, error message or None)
+    """
+    destination = params.get('destination', '').strip()
+    days = params.get('days', '').strip()
+    interests = params.get('interests', '').strip()
+    if not (destination and days and interests):
+        return destination, None, interests, 'Please fill in all fields.'
+    try:
+        days = int(days)
+    except ValueError:
+        return destination, None, interests, 'Please enter a valid number of days.'
+    error = itinerary_days_error(days)
+    return destination, None if error else days, interests, error
+
+
+def _wants_json(request):
+    """Whether the request came from the planner's fetch() call rather than a form post."""
+    return request.headers.get('x-requested-with') == 'XMLHttpRequest'
+
+
+def _job_accepted(job):
+    """202 response telling the page where to poll for a queued job."""
+    data = job.as_dict()
+    data['status_url'] = reverse('ai-job-status', args=[job.pk])
+    return JsonResponse(data, status=202)
+
+
 @login_required
 def ai_itinerary_planner(request):
     """AI-powered itinerary planning"""
     result = None
+    job = None
     destinations = Destination.objects.all()
+
+    # With background jobs on, the page's script posts here and polls the job
+    if request.method == 'POST' and settings.AI_JOBS_ENABLED and _wants_json(request):
+        destination, days, interests, error = _itinerary_params(request.POST)
+        if error:
+            return JsonResponse({'error': error}, status=400)
+        job = enqueue_job(
+            'generate_itinerary_plan', request.user,
+            destination=destination, days=days, interests=interests
+        )
+        return _job_accepted(job)
     
     if request.method == 'POST':
-        destination = request.POST.get('destination', '').strip()
-        days = request.POST.get('days', '').strip()
-        interests = request.POST.get('interests', '').strip()
-        
-        if destination and days and interests:
-            try:
-                days_int = int(days)
-                result = ai_assistant.generate_itinerary_plan(
-                    destination, 
-                    days_int, 
-                    interests
-                )
-                
-                if result and not result.get('success'):
-                    messages.error(request, result.get('error', 'AI service unavailable'))
-                elif result and result.get('success'):
-                    messages.success(request, 'AI itinerary generated! You can use this to create your trip.')
-            except ValueError:
-                messages.error(request, 'Please enter a valid number of days.')
+        destination, days, interests, error = _itinerary_params(request.POST)
+        if error:
+            messages.error(request, error)
+        elif settings.AI_JOBS_ENABLED:
+            job = enqueue_job(
+                'generate_itinerary_plan', request.user,
+                destination=destination, days=days, interests=interests
+            )
+            messages.info(request, 'Your itinerary is being generated. It will appear here shortly.')
         else:
-            messages.warning(request, 'Please fill in all fields.')
-    
+            result = ai_assistant.generate_itinerary_plan(destination, days, interests)
+            if not result.get('success'):
+                messages.error(request, result.get('error', 'AI service unavailable'))
+            else:
+                messages.success(request, 'AI itinerary generated! You can use this to create your trip.')
+
     context = {
         'result': result,
+        'job': job,
+        'jobs_enabled': settings.AI_JOBS_ENABLED,
+        'job_page_wait': settings.AI_JOB_PAGE_WAIT,
+        'max_days': settings.AI_ITINERARY_MAX_DAYS,
         'destinations': destinations,
         'page_title': 'AI Itinerary Planner'
     }
     return render(request, 'ai/ai_itinerary_planner.html', context)
 
 
+@login_required
+@require_GET
+def ai_job_status(request, job_id):
+    """Polling endpoint for a queued AI job"""
+    job = get_object_or_404(AIJob, pk=job_id, user=request.user)
+    return JsonResponse(job.as_dict())
+
+
+def _sse(data, event=None):
+    """Format one server-sent event."""
+    prefix = f'event: {event}\n' if event else ''
+    return f'{prefix}data: {json.dumps(data)}\n\n'
+
+
+def _sse_response(events):
+    """Wrap an event iterator in a streaming text/event-stream response."""
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Disable proxy buffering (nginx)
+    return response
+
+
+@login_required
+@require_GET
+def ai_itinerary_stream(request):
+    """Stream an AI itinerary as server-sent events while it is generated"""
+    destination, days, interests, error = _itinerary_params(request.GET)
+
+    def events():
+        if error:
+            yield _sse({'error': error}, event='ai-error')
+            return
+        try:
+            for text in ai_assistant.stream_itinerary_plan(destination, days, interests):
+                yield _sse({'text': text})
+        except Exception as e:
+            yield _sse({'error': f'AI service error: {str(e)}'}, event='ai-error')
+            return
+        yield _sse({'destination': destination, 'days': days}, event='done')
+
+    return _sse_response(events())
+
+
 def ai_destination_insights(request, destination_id):
     """Get AI-generated insights for a specific destination"""
     destination = Destination.objects.get(pk=destination_id)
     
-    # Generate travel tips
-    tips_result = ai_assistant.get_travel_tips(
-        destination.name, 
-        destination.best_season
-    )
+    # Stored insight when available; generated live (and stored) otherwise
+    tips_result = get_destination_tips(destination)
     
     context = {
         'destination': destination,
@@ -91,3 +183,127 @@ def ai_destination_insights(request, destination_id):
         'page_title': f'AI Insights - {destination.name}'
     }
     return render(request, 'ai/ai_insights.html', context)
+
+
+# Async views, routed instead of the sync ones when AI_ASYNC_VIEWS is on
+# (SERVER_MODE=asgi). Groq calls use the async client, so a single worker
+# process can keep many slow completions in flight. Templates are rendered
+# through sync_to_async because the session, messages and user lookups
+# they trigger use the ORM.
+
+async def ai_travel_assistant_async(request):
+    """Async version of ai_travel_assistant"""
+    result = None
+
+    if request.method == 'POST':
+        query = request.POST.get('query', '').strip()
+        action = request.POST.get('action', 'recommend')
+
+        if query:
+            if action == 'recommend':
+                result = await ai_assistant.aget_destination_recommendations(query)
+            elif action == 'question':
+                result = await ai_assistant.aanswer_travel_question(query)
+
+            if result and not result.get('success'):
+                messages.error(request, result.get('error', 'AI service unavailable'))
+        else:
+            messages.warning(request, 'Please enter your travel query.')
+
+    context = {
+        'result': result,
+        'groq_status': ai_assistant.check_groq_status(),
+        'page_title': 'AI Travel Assistant'
+    }
+    return await sync_to_async(render)(request, 'ai/ai_assistant.html', context)
+
+
+@login_required
+async def ai_itinerary_planner_async(request):
+    """Async version of ai_itinerary_planner"""
+    result = None
+    job = None
+
+    if request.method == 'POST' and settings.AI_JOBS_ENABLED and _wants_json(request):
+        destination, days, interests, error = _itinerary_params(request.POST)
+        if error:
+            return JsonResponse({'error': error}, status=400)
+        user = await request.auser()
+        job = await sync_to_async(enqueue_job)(
+            'generate_itinerary_plan', user,
+            destination=destination, days=days, interests=interests
+        )
+        return _job_accepted(job)
+
+    if request.method == 'POST':
+        destination, days, interests, error = _itinerary_params(request.POST)
+        if error:
+            messages.error(request, error)
+        elif settings.AI_JOBS_ENABLED:
+            job = await sync_to_async(enqueue_job)(
+                'generate_itinerary_plan', await request.auser(),
+                destination=destination, days=days, interests=interests
+            )
+            messages.info(request, 'Your itinerary is being generated. It will appear here shortly.')
+        else:
+            result = await ai_assistant.agenerate_itinerary_plan(destination, days, interests)
+            if not result.get('success'):
+                messages.error(request, result.get('error', 'AI service unavailable'))
+            else:
+                messages.success(request, 'AI itinerary generated! You can use this to create your trip.')
+
+    context = {
+        'result': result,
+        'job': job,
+        'jobs_enabled': settings.AI_JOBS_ENABLED,
+        'job_page_wait': settings.AI_JOB_PAGE_WAIT,
+        'max_days': settings.AI_ITINERARY_MAX_DAYS,
+        'destinations': Destination.objects.all(),
+        'page_title': 'AI Itinerary Planner'
+    }
+    return await sync_to_async(render)(request, 'ai/ai_itinerary_planner.html', context)
+
+
+@login_required
+@require_GET
+async def ai_itinerary_stream_async(request):
+    """Async version of ai_itinerary_stream"""
+    destination, days, interests, error = _itinerary_params(request.GET)
+
+    async def events():
+        if error:
+            yield _sse({'error': error}, event='ai-error')
+            return
+        try:
+            async for text in ai_assistant.astream_itinerary_plan(destination, days, interests):
+                yield _sse({'text': text})
+        except Exception as e:
+            yield _sse({'error': f'AI service error: {str(e)}'}, event='ai-error')
+            return
+        yield _sse({'destination': destination, 'days': days}, event='done')
+
+    return _sse_response(events())
+
+
+async def ai_destination_insights_async(request, destination_id):
+    """Async version of ai_destination_insights"""
+    destination = await Destination.objects.aget(pk=destination_id)
+
+    insight = await sync_to_async(get_insight)(destination)
+    if insight is not None:
+        if insight.is_stale():
+            await sync_to_async(schedule_refresh)(destination, force=True)
+        tips_result = insight.as_tips()
+    else:
+        tips_result = await ai_assistant.aget_travel_tips(
+            destination.name,
+            destination.best_season
+        )
+        await sync_to_async(save_insight)(destination, tips_result)
+
+    context = {
+        'destination': destination,
+        'ai_tips': tips_result,
+        'page_title': f'AI Insights - {destination.name}'
+    }
+    return await sync_to_async(render)(request, 'ai/ai_insights.html', context)
@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'destinations',
     'itineraries',
     'weather',
+    'ai',
 ]
 
 MIDDLEWARE = [
@@ -46,6 +47,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'deadlines.DeadlineMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -77,6 +79,25 @@ DATABASES = {
     )
 }
 
+# SQLite: take the write lock when a transaction starts, so concurrent writers
+# (itinerary chunk threads, the AI job worker, background refreshes) wait for
+# each other instead of failing with "database is locked"
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default'].setdefault('OPTIONS', {}).update(transaction_mode='IMMEDIATE', timeout=20)
+
+# Cache
+# Defaults to a per-process in-memory cache. Point CACHE_BACKEND/CACHE_LOCATION at a
+# shared backend (e.g. django.core.cache.backends.redis.RedisCache) in production so
+# every gunicorn worker sees the same cached weather. The weather_cache_stats
+# command refuses to run without one, and refresh_weather (the Procfile's
+# weather process) exits with a warning.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='travel-planner'),
+    }
+}
+
 # Password validation - Disabled for flexibility
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -116,10 +137,149 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
 }
+# Largest page a client may ask for with ?page_size= on the cursor-paginated APIs
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=100, cast=int)
+
+# Ranked results returned by a destination search (page and /destinations/api/search/)
+DESTINATION_SEARCH_LIMIT = config('DESTINATION_SEARCH_LIMIT', default=50, cast=int)
+# Destinations per page when browsing without search text
+DESTINATION_PAGE_SIZE = config('DESTINATION_PAGE_SIZE', default=24, cast=int)
+# Catalog-wide facet counts of the browse page are cached until a destination
+# changes; the lifetime only matters for bulk edits that send no signals
+DESTINATION_FACETS_CACHE_TTL = config('DESTINATION_FACETS_CACHE_TTL', default=3600, cast=int)
 
 # OpenWeatherMap API Configuration
 OPENWEATHER_API_KEY = config('OPENWEATHER_API_KEY', default='')
 OPENWEATHER_API_URL = 'https://api.openweathermap.org/data/2.5/weather'
+OPENWEATHER_GROUP_URL = 'https://api.openweathermap.org/data/2.5/group'
+OPENWEATHER_GEOCODING_URL = 'https://api.openweathermap.org/geo/1.0/direct'
+
+# Weather HTTP client (pooled keep-alive session with retries)
+WEATHER_HTTP_POOL_SIZE = config('WEATHER_HTTP_POOL_SIZE', default=10, cast=int)
+WEATHER_HTTP_MAX_RETRIES = config('WEATHER_HTTP_MAX_RETRIES', default=2, cast=int)
+WEATHER_HTTP_BACKOFF = config('WEATHER_HTTP_BACKOFF', default=0.3, cast=float)
+WEATHER_HTTP_CONNECT_TIMEOUT = config('WEATHER_HTTP_CONNECT_TIMEOUT', default=2.0, cast=float)
+WEATHER_HTTP_READ_TIMEOUT = config('WEATHER_HTTP_READ_TIMEOUT', default=4.0, cast=float)
+
+# Weather cache lifetimes (seconds)
+WEATHER_CACHE_TTL = config('WEATHER_CACHE_TTL', default=600, cast=int)
+WEATHER_CACHE_STALE_TTL = config('WEATHER_CACHE_STALE_TTL', default=1800, cast=int)
+WEATHER_ERROR_CACHE_TTL = config('WEATHER_ERROR_CACHE_TTL', default=120, cast=int)
+
+# Background refresher (refresh_weather command; does nothing without the shared cache backend above)
+WEATHER_ACTIVE_WINDOW = config('WEATHER_ACTIVE_WINDOW', default=86400, cast=int)
+WEATHER_REFRESH_INTERVAL = config('WEATHER_REFRESH_INTERVAL', default=600, cast=int)
+WEATHER_REFRESH_RATE_LIMIT = config('WEATHER_REFRESH_RATE_LIMIT', default=50, cast=int)  # calls per minute
+
+# Stored weather snapshots: retention and fallback when the API is down
+WEATHER_HOURLY_RETENTION_DAYS = config('WEATHER_HOURLY_RETENTION_DAYS', default=7, cast=int)
+WEATHER_DAILY_RETENTION_DAYS = config('WEATHER_DAILY_RETENTION_DAYS', default=365, cast=int)
+WEATHER_SNAPSHOT_FALLBACK_MAX_AGE = config('WEATHER_SNAPSHOT_FALLBACK_MAX_AGE', default=21600, cast=int)
+
+# Browser cache lifetime for the deferred weather widget (seconds)
+WEATHER_WIDGET_MAX_AGE = config('WEATHER_WIDGET_MAX_AGE', default=300, cast=int)
+
+# Bulk weather (destination list page)
+WEATHER_BULK_MAX_WORKERS = config('WEATHER_BULK_MAX_WORKERS', default=8, cast=int)
+WEATHER_BULK_TIMEOUT = config('WEATHER_BULK_TIMEOUT', default=3.0, cast=float)
+
+# Time budgets (seconds) for views that call Groq or OpenWeatherMap, by URL name.
+# Outbound calls get the time left as their timeout and are not started with less
+# than REQUEST_DEADLINE_MIN_CALL seconds left (see deadlines.py). SSE streams are
+# not budgeted; each of their calls is bounded by AI_REQUEST_TIMEOUT.
+AI_PAGE_DEADLINE = config('AI_PAGE_DEADLINE', default=30.0, cast=float)
+WEATHER_PAGE_DEADLINE = config('WEATHER_PAGE_DEADLINE', default=8.0, cast=float)
+REQUEST_DEADLINES = {
+    'ai-assistant': AI_PAGE_DEADLINE,
+    'ai-planner': config('AI_PLANNER_DEADLINE', default=60.0, cast=float),
+    'ai-insights': AI_PAGE_DEADLINE,
+    'destinations:list': WEATHER_PAGE_DEADLINE,
+    'destinations:detail': WEATHER_PAGE_DEADLINE,
+    'weather:widget': WEATHER_PAGE_DEADLINE,
+    'weather:api': WEATHER_PAGE_DEADLINE,
+}
+REQUEST_DEADLINE_MIN_CALL = config('REQUEST_DEADLINE_MIN_CALL', default=1.0, cast=float)
+
+# Circuit breakers for Groq and OpenWeatherMap (see circuit_breaker.py). A breaker
+# opens when at least CIRCUIT_BREAKER_MIN_CALLS calls in a window fail at
+# CIRCUIT_BREAKER_FAILURE_RATE or more, and probes again after OPEN_SECONDS.
+CIRCUIT_BREAKER_FAILURE_RATE = config('CIRCUIT_BREAKER_FAILURE_RATE', default=0.5, cast=float)
+CIRCUIT_BREAKER_MIN_CALLS = config('CIRCUIT_BREAKER_MIN_CALLS', default=5, cast=int)
+CIRCUIT_BREAKER_WINDOW = config('CIRCUIT_BREAKER_WINDOW', default=60, cast=int)
+CIRCUIT_BREAKER_OPEN_SECONDS = config('CIRCUIT_BREAKER_OPEN_SECONDS', default=30, cast=int)
 
 # Groq API Configuration
 GROQ_API_KEY = config('GROQ_API_KEY', default='')
+# Seconds before a Groq request times out, and SDK retries after a failure
+AI_REQUEST_TIMEOUT = config('AI_REQUEST_TIMEOUT', default=30.0, cast=float)
+AI_REQUEST_MAX_RETRIES = config('AI_REQUEST_MAX_RETRIES', default=1, cast=int)
+
+# Server mode: 'wsgi' (gunicorn sync workers) or 'asgi' (uvicorn workers, see gunicorn.conf.py).
+# In ASGI mode the AI pages are served by async views using the async Groq client.
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+AI_ASYNC_VIEWS = config('AI_ASYNC_VIEWS', default=SERVER_MODE == 'asgi', cast=bool)
+
+# Groq models. Methods listed in AI_MODEL_ROUTES use that model, the rest use
+# AI_DEFAULT_MODEL; a failed call is retried once on the model's fallback.
+AI_DEFAULT_MODEL = config('AI_DEFAULT_MODEL', default='llama-3.3-70b-versatile')
+AI_FAST_MODEL = config('AI_FAST_MODEL', default='llama-3.1-8b-instant')
+AI_MODEL_ROUTES = {
+    'get_destination_recommendations': AI_FAST_MODEL,
+    'enhance_destination_description': AI_FAST_MODEL,
+    'get_travel_tips': AI_FAST_MODEL,
+    'answer_travel_question': AI_FAST_MODEL,
+    'generate_itinerary_plan': AI_DEFAULT_MODEL,
+}
+AI_MODEL_FALLBACKS = {
+    AI_DEFAULT_MODEL: AI_FAST_MODEL,
+    AI_FAST_MODEL: AI_DEFAULT_MODEL,
+}
+
+# AI response cache: Django's cache in front of the ai.AIResponse table
+AI_CACHE_ENABLED = config('AI_CACHE_ENABLED', default=True, cast=bool)
+AI_CACHE_MAX_ENTRIES = config('AI_CACHE_MAX_ENTRIES', default=5000, cast=int)
+AI_CACHE_DEFAULT_TTL = 6 * 60 * 60
+AI_CACHE_TTLS = {
+    'get_destination_recommendations': 6 * 60 * 60,
+    'answer_travel_question': 6 * 60 * 60,
+    'generate_itinerary_plan': 24 * 60 * 60,
+    'get_travel_tips': 7 * 24 * 60 * 60,
+    'enhance_destination_description': 7 * 24 * 60 * 60,
+}
+
+# Identical concurrent AI requests share one upstream call; other workers wait
+# on the cache lock for up to AI_SINGLE_FLIGHT_TIMEOUT seconds
+AI_SINGLE_FLIGHT_TIMEOUT = config('AI_SINGLE_FLIGHT_TIMEOUT', default=60, cast=int)
+AI_SINGLE_FLIGHT_POLL_INTERVAL = config('AI_SINGLE_FLIGHT_POLL_INTERVAL', default=0.2, cast=float)
+
+# Client-side Groq rate limits, shared by all workers through the cache.
+# Match them to your Groq plan; AI_RATE_LIMIT_RPM=0 turns the governor off.
+AI_RATE_LIMIT_RPM = config('AI_RATE_LIMIT_RPM', default=30, cast=int)
+AI_RATE_LIMIT_TPM = config('AI_RATE_LIMIT_TPM', default=12000, cast=int)
+AI_RATE_WINDOW = config('AI_RATE_WINDOW', default=10, cast=int)
+AI_RATE_QUEUE_SIZE = config('AI_RATE_QUEUE_SIZE', default=20, cast=int)
+AI_RATE_MAX_WAIT = config('AI_RATE_MAX_WAIT', default=15.0, cast=float)
+
+# Precomputed destination insights (see the generate_insights command)
+AI_INSIGHT_MAX_AGE = config('AI_INSIGHT_MAX_AGE', default=30 * 24 * 60 * 60, cast=int)
+AI_INSIGHT_REFRESH_ON_SAVE = config('AI_INSIGHT_REFRESH_ON_SAVE', default=True, cast=bool)
+
+# Longest itinerary the planner accepts, in days
+AI_ITINERARY_MAX_DAYS = config('AI_ITINERARY_MAX_DAYS', default=30, cast=int)
+# Itineraries longer than AI_ITINERARY_CHUNK_DAYS are generated as concurrent day ranges
+AI_ITINERARY_CHUNK_DAYS = config('AI_ITINERARY_CHUNK_DAYS', default=7, cast=int)
+AI_ITINERARY_MAX_PARALLEL = config('AI_ITINERARY_MAX_PARALLEL', default=5, cast=int)
+
+# Background AI jobs (run with: python manage.py run_ai_jobs). With jobs on, the
+# itinerary planner queues generations instead of running them in the request,
+# so only turn them on where a worker process runs (the Procfile's aiworker;
+# railway.json starts the web process alone).
+AI_JOBS_ENABLED = config('AI_JOBS_ENABLED', default=False, cast=bool)
+AI_JOB_CONCURRENCY = config('AI_JOB_CONCURRENCY', default=4, cast=int)
+AI_JOB_POLL_INTERVAL = config('AI_JOB_POLL_INTERVAL', default=1.0, cast=float)
+AI_JOB_TIMEOUT = config('AI_JOB_TIMEOUT', default=10 * 60, cast=int)
+AI_JOB_MAX_ATTEMPTS = config('AI_JOB_MAX_ATTEMPTS', default=2, cast=int)
+AI_JOB_RETENTION = config('AI_JOB_RETENTION', default=7 * 24 * 60 * 60, cast=int)
+AI_JOB_RATE_MAX_WAIT = config('AI_JOB_RATE_MAX_WAIT', default=120.0, cast=float)
+# How long the planner page polls a queued job before giving up
+AI_JOB_PAGE_WAIT = config('AI_JOB_PAGE_WAIT', default=5 * 60, cast=int)
@@ -1,22 +1,38 @@
 """
 URL configuration for backend project.
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import TemplateView
 import ai_views
 
+# Under ASGI the AI pages use async views so slow Groq calls don't hold a worker
+if settings.AI_ASYNC_VIEWS:
+    ai_travel_assistant = ai_views.ai_travel_assistant_async
+    ai_itinerary_planner = ai_views.ai_itinerary_planner_async
+    ai_itinerary_stream = ai_views.ai_itinerary_stream_async
+    ai_destination_insights = ai_views.ai_destination_insights_async
+else:
+    ai_travel_assistant = ai_views.ai_travel_assistant
+    ai_itinerary_planner = ai_views.ai_itinerary_planner
+    ai_itinerary_stream = ai_views.ai_itinerary_stream
+    ai_destination_insights = ai_views.ai_destination_insights
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('', TemplateView.as_view(template_name='home.html'), name='home'),
     path('users/', include('users.urls')),
     path('destinations/', include('destinations.urls')),
     path('itineraries/', include('itineraries.urls')),
+    path('weather/', include('weather.urls')),
     
     # AI-powered features
-    path('ai-assistant/', ai_views.ai_travel_assistant, name='ai-assistant'),
-    path('ai-planner/', ai_views.ai_itinerary_planner, name='ai-planner'),
-    path('ai-insights/<int:destination_id>/', ai_views.ai_destination_insights, name='ai-insights'),
+    path('ai-assistant/', ai_travel_assistant, name='ai-assistant'),
+    path('ai-planner/', ai_itinerary_planner, name='ai-planner'),
+    path('ai-planner/stream/', ai_itinerary_stream, name='ai-planner-stream'),
+    path('ai-jobs/<int:job_id>/', ai_views.ai_job_status, name='ai-job-status'),
+    path('ai-insights/<int:destination_id>/', ai_destination_insights, name='ai-insights'),
 ]
 
 # Customize admin site headers
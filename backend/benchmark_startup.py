@@ -0,0 +1,81 @@
+"""
+Measure process start-up cost for management commands and web workers.
+Run this with: python benchmark_startup.py [--runs N] [--baseline]
+
+Each scenario runs in a fresh interpreter, so module import time is counted
+the way gunicorn and the Procfile's migrate/collectstatic steps pay it. The
+"groq loaded" column shows whether the Groq SDK was imported at all.
+--baseline imports the SDK before each scenario, as start-up did before the
+Groq clients were built lazily; compare both runs to see what that saves.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Printed by each scenario after start-up so we can tell if groq was imported
+REPORT = "import sys; print('groq' in sys.modules)"
+
+# Prepended to each scenario in --baseline mode
+EAGER_GROQ = "import groq; "
+
+SCENARIOS = {
+    # Loads settings, apps and (through the URL checks) backend.urls and ai_views
+    'manage.py check': [
+        sys.executable, '-c',
+        "import os, sys; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings'); "
+        "from django.core.management import execute_from_command_line; "
+        "execute_from_command_line(['manage.py', 'check', '-v', '0']); " + REPORT,
+    ],
+    # What a gunicorn worker does before serving its first request
+    'worker boot': [
+        sys.executable, '-c',
+        "from backend.wsgi import application; from django.urls import get_resolver; "
+        "get_resolver().url_patterns; " + REPORT,
+    ],
+}
+
+
+def eager(command):
+    """Return a scenario command that imports the Groq SDK first."""
+    return [*command[:-1], EAGER_GROQ + command[-1]]
+
+
+def run(command):
+    """Run one scenario and return (seconds, groq_loaded)."""
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, result.stdout.strip().splitlines()[-1] == 'True'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Runs per scenario (default: 10)')
+    parser.add_argument(
+        '--baseline', action='store_true',
+        help='Import the Groq SDK up front, as start-up did before it was loaded lazily',
+    )
+    args = parser.parse_args()
+
+    print(f"{'scenario':<18} {'median':>8} {'min':>8} {'max':>8}  groq loaded")
+    for name, command in SCENARIOS.items():
+        if args.baseline:
+            command = eager(command)
+        run(command)  # Warm the filesystem and bytecode caches
+        timings, groq_loaded = [], False
+        for _ in range(args.runs):
+            elapsed, groq_loaded = run(command)
+            timings.append(elapsed * 1000)
+        print(
+            f"{name:<18} {statistics.median(timings):>6.0f}ms {min(timings):>6.0f}ms "
+            f"{max(timings):>6.0f}ms  {'yes' if groq_loaded else 'no'}"
+        )
+
+
+if __name__ == '__main__':
+    main()
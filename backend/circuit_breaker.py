@@ -0,0 +1,220 @@
+"""
+Circuit breaker shared by the Groq and OpenWeatherMap clients.
+
+Each breaker counts calls and failures per CIRCUIT_BREAKER_WINDOW in Django's
+cache, so all gunicorn workers see the same state when CACHE_BACKEND is
+shared. Once at least CIRCUIT_BREAKER_MIN_CALLS calls were made in a window
+and the failure rate reaches CIRCUIT_BREAKER_FAILURE_RATE, the breaker opens:
+callers get their fallback immediately instead of waiting out a timeout. After
+CIRCUIT_BREAKER_OPEN_SECONDS the breaker is half-open and lets a single probe
+call through; its outcome closes or re-opens the circuit. The a-prefixed
+methods use the cache's async API, for use inside the event loop.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitOpenError(Exception):
+    """Raised by CircuitBreaker.call() while the circuit is open"""
+
+    def __init__(self, name):
+        self.name = name
+        super().__init__(f'{name} is temporarily unavailable. Please try again shortly.')
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker with its state kept in the cache"""
+
+    def __init__(self, name, failure_rate=0.5, min_calls=5, window=60, open_seconds=30):
+        """
+        Args:
+            name: Dependency name, used in cache keys and error messages
+            failure_rate: Share of failed calls in a window that opens the circuit
+            min_calls: Calls needed in a window before the rate is considered
+            window: Seconds per counting window
+            open_seconds: Seconds the circuit stays open before a probe is allowed
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+
+    @classmethod
+    def from_settings(cls, name):
+        """Build a breaker from the CIRCUIT_BREAKER_* settings."""
+        return cls(
+            name,
+            failure_rate=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+            min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+            window=settings.CIRCUIT_BREAKER_WINDOW,
+            open_seconds=settings.CIRCUIT_BREAKER_OPEN_SECONDS,
+        )
+
+    def _key(self, kind):
+        return f'circuit:{self.name}:{kind}'
+
+    def _count(self, kind):
+        key = self._key(f'{kind}:{int(time.time() // self.window)}')
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=self.window * 2)
+            return cache.incr(key)
+
+    async def _acount(self, kind):
+        key = self._key(f'{kind}:{int(time.time() // self.window)}')
+        try:
+            return await cache.aincr(key)
+        except ValueError:
+            await cache.aadd(key, 0, timeout=self.window * 2)
+            return await cache.aincr(key)
+
+    def _state(self, opened_until):
+        if opened_until is None:
+            return CLOSED
+        return OPEN if time.time() < opened_until else HALF_OPEN
+
+    def state(self):
+        """Return CLOSED, OPEN or HALF_OPEN."""
+        return self._state(cache.get(self._key('open-until')))
+
+    async def astate(self):
+        """Async version of state()"""
+        return self._state(await cache.aget(self._key('open-until')))
+
+    def allow(self):
+        """
+        Whether a call may go upstream now.
+
+        In the half-open state only the first caller (the probe) is allowed;
+        the probe slot frees itself if that caller never reports back.
+        """
+        state = self.state()
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        return cache.add(self._key('probe'), True, timeout=max(self.open_seconds, 10))
+
+    async def aallow(self):
+        """Async version of allow()"""
+        state = await self.astate()
+        if state == CLOSED:
+            return True
+        if state == OPEN:
+            return False
+        return await cache.aadd(self._key('probe'), True, timeout=max(self.open_seconds, 10))
+
+    def _closing_keys(self):
+        """Keys dropped when a probe succeeds: the open marker and this window's counts."""
+        window = int(time.time() // self.window)
+        return [
+            self._key('open-until'), self._key('probe'),
+            self._key(f'calls:{window}'), self._key(f'failures:{window}'),
+        ]
+
+    def _open(self):
+        # The open-until marker outlives the open period so the breaker reads as half-open afterwards
+        cache.set(self._key('open-until'), time.time() + self.open_seconds, timeout=None)
+        cache.delete(self._key('probe'))
+
+    async def _aopen(self):
+        await cache.aset(self._key('open-until'), time.time() + self.open_seconds, timeout=None)
+        await cache.adelete(self._key('probe'))
+
+    def record_success(self):
+        """Report a successful call; a successful probe closes the circuit with fresh counts."""
+        if self.state() == HALF_OPEN:
+            cache.delete_many(self._closing_keys())
+        self._count('calls')
+
+    async def arecord_success(self):
+        """Async version of record_success()"""
+        if await self.astate() == HALF_OPEN:
+            await cache.adelete_many(self._closing_keys())
+        await self._acount('calls')
+
+    def record_failure(self):
+        """Report a failed call; opens the circuit when the failure rate is reached."""
+        if self.state() != CLOSED:
+            self._open()
+            return
+        calls = self._count('calls')
+        failures = self._count('failures')
+        if calls >= self.min_calls and failures / calls >= self.failure_rate:
+            self._open()
+
+    async def arecord_failure(self):
+        """Async version of record_failure()"""
+        if await self.astate() != CLOSED:
+            await self._aopen()
+            return
+        calls = await self._acount('calls')
+        failures = await self._acount('failures')
+        if calls >= self.min_calls and failures / calls >= self.failure_rate:
+            await self._aopen()
+
+    def call(self, func, is_failure=lambda error: True):
+        """
+        Run func() through the breaker.
+
+        Args:
+            func: Zero-argument callable making the upstream call
+            is_failure: Tells whether an exception counts against the dependency;
+                        other exceptions (e.g. a 400 answer) are not recorded
+
+        Raises:
+            CircuitOpenError: The circuit is open; func() was not called
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name)
+        try:
+            result = func()
+        except Exception as e:
+            if is_failure(e):
+                self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+    async def acall(self, func, is_failure=lambda error: True):
+        """Async version of call(); func is a coroutine function"""
+        if not await self.aallow():
+            raise CircuitOpenError(self.name)
+        try:
+            result = await func()
+        except Exception as e:
+            if is_failure(e):
+                await self.arecord_failure()
+            raise
+        await self.arecord_success()
+        return result
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name):
+    """
+    Return the process-wide breaker for a dependency, creating it on first use.
+
+    Args:
+        name: Dependency name, e.g. 'openweathermap' or 'groq:<model>'
+
+    Returns:
+        CircuitBreaker: Breaker configured from settings
+    """
+    breaker = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(name, CircuitBreaker.from_settings(name))
+    return breaker
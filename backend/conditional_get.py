@@ -0,0 +1,79 @@
+"""
+Conditional GET (ETag / Last-Modified) for the REST API viewsets.
+
+Validators come from a single aggregate query over the same queryset the
+view would serialize: the latest `updated_at` of every field in
+`last_modified_fields` plus the row count, so deletions change the ETag too.
+A matching If-None-Match or If-Modified-Since is answered with 304 before
+anything is loaded or serialized.
+
+List responses carry only the ETag: deleting a row doesn't move the latest
+`updated_at`, so If-Modified-Since would keep answering 304 for a stale list.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+class ConditionalGetMixin:
+    """
+    Add ETag to list() and ETag and Last-Modified to retrieve() of a ModelViewSet.
+
+    Views whose responses include related rows list those rows' timestamps
+    in `last_modified_fields` (e.g. 'destination__updated_at').
+    """
+    last_modified_fields = ('updated_at',)
+
+    def _validators(self, queryset):
+        """
+        Return (etag, last_modified) for a queryset, or None if it is empty.
+
+        The ETag covers the full URL (cursor, filters) and the response
+        format, since each of them gives a different body.
+        """
+        values = queryset.order_by().aggregate(
+            count=Count('pk'),
+            **{f'max_{i}': Max(field) for i, field in enumerate(self.last_modified_fields)}
+        )
+        timestamps = [values[f'max_{i}'] for i in range(len(self.last_modified_fields))]
+        timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+        last_modified = max(timestamps) if timestamps else None
+        state = '|'.join([
+            str(values['count']),
+            last_modified.isoformat() if last_modified else '',
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+        ])
+        return quote_etag(hashlib.md5(state.encode()).hexdigest()), last_modified
+
+    def _conditional(self, queryset, respond, use_last_modified=True):
+        """Answer 304 if the client's copy is current, else respond() with validators set."""
+        etag, last_modified = self._validators(queryset)
+        timestamp = int(last_modified.timestamp()) if last_modified and use_last_modified else None
+        response = get_conditional_response(self.request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = respond()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self._conditional(
+            self.filter_queryset(self.get_queryset()),
+            lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs),
+            use_last_modified=False,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self._conditional(
+            queryset,
+            lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs),
+        )
@@ -0,0 +1,109 @@
+"""
+Per-request deadlines for views that call Groq or OpenWeatherMap.
+
+DeadlineMiddleware gives each request a time budget from REQUEST_DEADLINES,
+keyed by URL name. Outbound calls read the time left with timeout_for(),
+which caps their timeout at it and refuses to start a call when less than
+REQUEST_DEADLINE_MIN_CALL seconds remain, so a slow dependency can't hold a
+worker past the budget.
+
+The deadline lives in a context variable: it follows the request into
+sync_to_async() threads and asyncio tasks, but plain threads only see it when
+started with contextvars.copy_context().run().
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.urls import Resolver404, resolve
+
+_deadline = ContextVar('request_deadline', default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when too little of the request's time budget is left for a call"""
+
+    def __init__(self):
+        super().__init__('This request took too long. Please try again.')
+
+
+def remaining():
+    """
+    Return the seconds left before the current deadline.
+
+    Returns:
+        float: Seconds left (may be negative), or None without a deadline
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def timeout_for(default):
+    """
+    Return the timeout to use for an outbound call.
+
+    Args:
+        default: The call's own timeout, in seconds
+
+    Returns:
+        float: `default`, cut to the time left before the deadline
+
+    Raises:
+        DeadlineExceeded: Less than REQUEST_DEADLINE_MIN_CALL seconds are left
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left < settings.REQUEST_DEADLINE_MIN_CALL:
+        raise DeadlineExceeded()
+    return min(default, left)
+
+
+@contextmanager
+def deadline(seconds):
+    """Run the block under a deadline `seconds` from now, or the current one if sooner."""
+    current = _deadline.get()
+    target = time.monotonic() + seconds
+    token = _deadline.set(target if current is None else min(current, target))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def _budget_for(request):
+    """Time budget of the view a request resolves to, from REQUEST_DEADLINES."""
+    try:
+        match = resolve(request.path_info)
+    except Resolver404:
+        return None
+    return settings.REQUEST_DEADLINES.get(match.view_name)
+
+
+class DeadlineMiddleware:
+    """Set the request deadline for views listed in REQUEST_DEADLINES"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        budget = _budget_for(request)
+        if budget is None:
+            return self.get_response(request)
+        with deadline(budget):
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        budget = _budget_for(request)
+        if budget is None:
+            return await self.get_response(request)
+        with deadline(budget):
+            return await self.get_response(request)
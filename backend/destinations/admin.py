@@ -1,5 +1,6 @@
 from django.contrib import admin
 from .models import Destination
+from .search import search_destinations
 
 
 @admin.register(Destination)
@@ -10,6 +11,13 @@ class DestinationAdmin(admin.ModelAdmin):
     search_fields = ('name', 'country', 'description')
     ordering = ('name',)
     readonly_fields = ('created_at', 'updated_at')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search through the full-text index instead of icontains scans"""
+        if not search_term.strip():
+            return queryset, False
+        matches = [destination.pk for destination in search_destinations(queryset, search_term)]
+        return queryset.filter(pk__in=matches), False
     
     fieldsets = (
         ('Basic Information', {
@@ -18,6 +26,10 @@ class DestinationAdmin(admin.ModelAdmin):
         ('Travel Details', {
             'fields': ('avg_budget', 'best_season')
         }),
+        ('Weather Lookup', {
+            'fields': ('latitude', 'longitude', 'weather_city_id'),
+            'classes': ('collapse',)
+        }),
         ('Metadata', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
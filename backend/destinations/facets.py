@@ -0,0 +1,147 @@
+"""
+Facet counts for the destination browse page.
+
+One GROUP BY query counts destinations per (country, best_season, budget
+bucket); every facet is folded from those rows in Python. Each facet counts
+the destinations matching the other two facets' selections, so a count is
+what the user gets by clicking that value.
+
+Without search text the rows cover the whole catalog and are cached until a
+Destination is saved or deleted (see destinations/signals.py).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, Value, When
+
+from .models import Destination
+from .search import filter_destinations, match_destinations
+
+FACETS_CACHE_KEY = 'destinations:facets'
+
+# (key, label, min_budget, max_budget) with inclusive bounds; clicking a bucket
+# sets the min_budget/max_budget filters to its bounds
+BUDGET_BUCKETS = (
+    ('budget', 'Under ₹25,000', None, 24999),
+    ('mid', '₹25,000 – ₹49,999', 25000, 49999),
+    ('premium', '₹50,000 – ₹99,999', 50000, 99999),
+    ('luxury', '₹1,00,000 and above', 100000, None),
+)
+
+
+def budget_bucket(min_budget, max_budget):
+    """
+    Return the budget bucket a min/max filter selects.
+
+    Returns:
+        str: The bucket key, None without a budget filter, or '' for a range
+             that is not exactly one bucket
+    """
+    if min_budget is None and max_budget is None:
+        return None
+    for key, _, low, high in BUDGET_BUCKETS:
+        if (low, high) == (min_budget, max_budget):
+            return key
+    return ''
+
+
+def _count_rows(queryset):
+    """Destination counts per (country, best_season, bucket), in one query."""
+    bucket = Case(
+        *[When(avg_budget__lte=high, then=Value(key)) for key, _, _, high in BUDGET_BUCKETS if high is not None],
+        default=Value(BUDGET_BUCKETS[-1][0]),
+    )
+    return list(
+        queryset.order_by()
+        .annotate(bucket=bucket)
+        .values('country', 'best_season', 'bucket')
+        .annotate(count=Count('pk'))
+    )
+
+
+def get_count_rows():
+    """Catalog-wide count rows, from the cache when possible."""
+    rows = cache.get(FACETS_CACHE_KEY)
+    if rows is None:
+        rows = _count_rows(Destination.objects.all())
+        cache.set(FACETS_CACHE_KEY, rows, timeout=settings.DESTINATION_FACETS_CACHE_TTL)
+    return rows
+
+
+def invalidate_facets():
+    """Drop the cached catalog-wide counts."""
+    cache.delete(FACETS_CACHE_KEY)
+
+
+def _fold(rows, field, selected, filters):
+    """Sum the rows matching `filters` per value of `field`."""
+    counts = {}
+    for row in rows:
+        if all(value is None or row[name] == value for name, value in filters.items()):
+            counts[row[field]] = counts.get(row[field], 0) + row['count']
+    if selected and selected not in counts:
+        counts[selected] = 0  # Keep the current selection visible so it can be cleared
+    return counts
+
+
+def _link(params, selected, **changes):
+    """Query string for the page with some filters set, or cleared if already selected."""
+    params = params.copy()
+    params.pop('page', None)  # The result set changes, so start from its first page
+    for name, value in changes.items():
+        params.pop(name, None)
+        if not selected and value is not None:
+            params[name] = value
+    return params.urlencode()
+
+
+def get_facets(form, params):
+    """
+    Facet values and counts for a valid DestinationSearchForm.
+
+    Args:
+        form: Valid DestinationSearchForm
+        params: The request's QueryDict, used to build each value's link
+
+    Returns:
+        dict: 'country', 'season' and 'budget' lists of dicts with 'value',
+              'label', 'count', 'selected' and 'query' (the link's query string)
+    """
+    data = form.cleaned_data
+    country = data['country'].strip() or None
+    season = data['season'] or None
+    bucket = budget_bucket(data['min_budget'], data['max_budget'])
+
+    search = data['q'].strip()
+    queryset = match_destinations(Destination.objects.all(), search) if search else Destination.objects.all()
+    if bucket == '':
+        # A custom range can't be split by bucket; count within it instead
+        queryset = filter_destinations(queryset, min_budget=data['min_budget'], max_budget=data['max_budget'])
+        bucket = None
+        rows = _count_rows(queryset)
+    elif search:
+        rows = _count_rows(queryset)
+    else:
+        rows = get_count_rows()
+
+    countries = _fold(rows, 'country', country, {'best_season': season, 'bucket': bucket})
+    seasons = _fold(rows, 'best_season', season, {'country': country, 'bucket': bucket})
+    buckets = _fold(rows, 'bucket', bucket, {'country': country, 'best_season': season})
+    season_labels = dict(Destination._meta.get_field('best_season').choices)
+
+    return {
+        'country': [
+            {'value': value, 'label': value, 'count': countries[value], 'selected': value == country,
+             'query': _link(params, value == country, country=value)}
+            for value in sorted(countries)
+        ],
+        'season': [
+            {'value': value, 'label': season_labels.get(value, value), 'count': seasons[value],
+             'selected': value == season, 'query': _link(params, value == season, season=value)}
+            for value in season_labels if value in seasons
+        ],
+        'budget': [
+            {'value': key, 'label': label, 'count': buckets.get(key, 0), 'selected': key == bucket,
+             'query': _link(params, key == bucket, min_budget=low, max_budget=high)}
+            for key, label, low, high in BUDGET_BUCKETS
+        ],
+    }
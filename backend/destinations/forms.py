@@ -0,0 +1,62 @@
+from django import forms
+from .models import Destination
+from .search import filter_destinations, search_destinations
+
+
+class DestinationSearchForm(forms.Form):
+    """Search text and browse filters for destinations (page and API)"""
+    q = forms.CharField(
+        required=False,
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Search destinations...'})
+    )
+    country = forms.CharField(
+        required=False,
+        max_length=100,
+        widget=forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Country'})
+    )
+    season = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Any season')] + Destination._meta.get_field('best_season').choices,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    min_budget = forms.IntegerField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Min ₹'})
+    )
+    max_budget = forms.IntegerField(
+        required=False,
+        min_value=0,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'Max ₹'})
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        min_budget, max_budget = cleaned_data.get('min_budget'), cleaned_data.get('max_budget')
+        if min_budget is not None and max_budget is not None and min_budget > max_budget:
+            raise forms.ValidationError('Minimum budget cannot be above the maximum budget.')
+        return cleaned_data
+
+    def filter(self, queryset):
+        """Apply the filters (not the search text) to a destination queryset."""
+        data = self.cleaned_data
+        return filter_destinations(
+            queryset,
+            country=data['country'].strip(),
+            season=data['season'],
+            min_budget=data['min_budget'],
+            max_budget=data['max_budget'],
+        )
+
+    def search(self, queryset, limit=None):
+        """
+        Return the matching destinations.
+
+        With search text the results are ranked, best match first, and cut
+        to `limit`; without it the filtered queryset is returned as is.
+        """
+        queryset = self.filter(queryset)
+        if self.cleaned_data['q'].strip():
+            return search_destinations(queryset, self.cleaned_data['q'], limit=limit)
+        return queryset
@@ -0,0 +1,55 @@
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from destinations.models import Destination
+from weather.client import get_weather_client
+
+
+class Command(BaseCommand):
+    """
+    Backfill coordinates and OpenWeatherMap city IDs on destinations.
+
+    Weather lookups by ID or coordinates are exact and avoid the repeated
+    404s that free-text lookups give for regions such as "Kerala".
+    """
+    help = 'Fill latitude, longitude and weather_city_id for destinations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-geocode destinations that already have coordinates')
+
+    def handle(self, *args, **options):
+        client = get_weather_client()
+        if not client.api_key:
+            raise CommandError('OPENWEATHER_API_KEY is not configured.')
+
+        destinations = Destination.objects.all()
+        if not options['force']:
+            destinations = destinations.filter(latitude__isnull=True)
+
+        updated = failed = 0
+        for destination in destinations:
+            try:
+                # Try "name,country" first, then the bare name for regions and island nations
+                coords = (client.geocode(f'{destination.name},{destination.country}')
+                          or client.geocode(destination.name))
+            except requests.exceptions.RequestException as e:
+                self.stderr.write(f'{destination}: geocoding failed ({e})')
+                failed += 1
+                continue
+
+            if coords is None:
+                self.stderr.write(f'{destination}: no geocoding match')
+                failed += 1
+                continue
+
+            destination.latitude, destination.longitude = coords
+            weather = client.get_current(destination.name, lat=destination.latitude, lon=destination.longitude)
+            destination.weather_city_id = weather.get('city_id') or None
+            destination.save(update_fields=['latitude', 'longitude', 'weather_city_id', 'updated_at'])
+            updated += 1
+            self.stdout.write(
+                f'{destination}: {destination.latitude:.4f}, {destination.longitude:.4f} '
+                f'(city id {destination.weather_city_id or "n/a"})'
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Geocoded {updated} destination(s), {failed} failed.'))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="destination",
+            name="latitude",
+            field=models.FloatField(
+                blank=True, help_text="Latitude used for weather lookups", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="destination",
+            name="longitude",
+            field=models.FloatField(
+                blank=True, help_text="Longitude used for weather lookups", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="destination",
+            name="weather_city_id",
+            field=models.PositiveIntegerField(
+                blank=True,
+                help_text="OpenWeatherMap city ID (filled by the geocode_destinations command)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0002_destination_weather_location"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="destination",
+            index=models.Index(
+                fields=["name", "id"], name="destination_name_c81d65_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:28
+
+from django.db import migrations, models
+
+# Frozen copies of the definitions in destinations/search.py as of this
+# migration, so later changes to that module can't alter what it creates
+FTS_TABLE = "destinations_destination_fts"
+
+SQLITE_SEARCH_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, country, description,
+        content='destinations_destination', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, country, description)
+        VALUES (new.id, new.name, new.country, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, country, description)
+        VALUES ('delete', old.id, old.name, old.country, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF name, country, description ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, country, description)
+        VALUES ('delete', old.id, old.name, old.country, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, country, description)
+        VALUES (new.id, new.name, new.country, new.description);
+    END""",
+]
+
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(country, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        for statement in SQLITE_SEARCH_SQL:
+            schema_editor.execute(statement)
+        schema_editor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    elif connection.vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE INDEX destination_search_idx ON destinations_destination "
+            f"USING GIN (({POSTGRES_DOCUMENT}))"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{trigger}")
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif connection.vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS destination_search_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("destinations", "0003_destination_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="destination",
+            index=models.Index(
+                fields=["country", "name"], name="destination_country_d4d77c_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="destination",
+            index=models.Index(
+                fields=["best_season", "name"], name="destination_best_se_dc3d88_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="destination",
+            index=models.Index(
+                fields=["avg_budget"], name="destination_avg_bud_5f0a6c_idx"
+            ),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -18,11 +18,26 @@ class Destination(models.Model):
             ('Year-round', 'Year-round'),
         ]
     )
+    latitude = models.FloatField(null=True, blank=True, help_text="Latitude used for weather lookups")
+    longitude = models.FloatField(null=True, blank=True, help_text="Longitude used for weather lookups")
+    weather_city_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="OpenWeatherMap city ID (filled by the geocode_destinations command)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['name']
+        indexes = [
+            # Keyset pagination (DestinationCursorPagination)
+            models.Index(fields=['name', 'id']),
+            # Browse and search filters (destinations/search.py)
+            models.Index(fields=['country', 'name']),
+            models.Index(fields=['best_season', 'name']),
+            models.Index(fields=['avg_budget']),
+        ]
         verbose_name = 'Destination'
         verbose_name_plural = 'Destinations'
 
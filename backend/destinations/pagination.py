@@ -0,0 +1,17 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class DestinationCursorPagination(CursorPagination):
+    """
+    Keyset pagination over (name, id), alphabetically.
+
+    Each page is one index range scan on (name, id), so deep pages cost the
+    same as the first and no COUNT(*) is run.
+    """
+    ordering = ('name', 'id')
+    page_size_query_param = 'page_size'
+
+    @property
+    def max_page_size(self):
+        return settings.API_MAX_PAGE_SIZE
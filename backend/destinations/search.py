@@ -0,0 +1,232 @@
+"""
+Full-text destination search over name, country and description.
+
+SQLite uses an FTS5 index (destinations_destination_fts) kept in sync with
+the destination table by triggers; PostgreSQL uses a GIN index on a weighted
+tsvector expression. Both are created by migration 0004. Other databases fall
+back to unindexed icontains lookups.
+
+Every word of the query must match and the last one may be a prefix, on
+SQLite ("term"*) and PostgreSQL (term:*) alike. Matches are ranked with name
+weighted over country over description, and are combined with the indexed
+country, best_season and avg_budget filters.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'destinations_destination_fts'
+
+# FTS5 external-content index, and triggers mirroring every change of the
+# searched columns into it. SQLite drops a table's triggers when a migration
+# rebuilds the table, so ensure_search_index() restores them after migrate.
+# Migration 0004 keeps its own copy; changing these needs a new migration.
+SQLITE_SEARCH_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, country, description,
+        content='destinations_destination', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, country, description)
+        VALUES (new.id, new.name, new.country, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, country, description)
+        VALUES ('delete', old.id, old.name, old.country, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF name, country, description ON destinations_destination BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, country, description)
+        VALUES ('delete', old.id, old.name, old.country, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, country, description)
+        VALUES (new.id, new.name, new.country, new.description);
+    END""",
+]
+
+# bm25() column weights for name, country and description
+SQLITE_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Must match the GIN index expression in migration 0004 for the index to be used
+POSTGRES_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(country, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def install_search_index(connection):
+    """Create and fill the SQLite FTS index and its triggers (see migration 0004)."""
+    with connection.cursor() as cursor:
+        for statement in SQLITE_SEARCH_SQL:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def ensure_search_index(using='default'):
+    """
+    Restore the SQLite FTS triggers if a migration rebuilt the destination table.
+
+    The index is repopulated when its triggers had to be recreated. Does
+    nothing on other databases or before migration 0004 is applied.
+    """
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or FTS_TABLE not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+            [f'{FTS_TABLE}_%'],
+        )
+        if cursor.fetchone()[0] < 3:
+            install_search_index(connection)
+
+
+def filter_destinations(queryset, country='', season='', min_budget=None, max_budget=None):
+    """
+    Apply the browse filters to a destination queryset.
+
+    Args:
+        queryset: Destination queryset
+        country: Exact country name
+        season: One of the best_season choices
+        min_budget: Lowest avg_budget, inclusive
+        max_budget: Highest avg_budget, inclusive
+
+    Returns:
+        QuerySet: The filtered queryset
+    """
+    if country:
+        queryset = queryset.filter(country=country)
+    if season:
+        queryset = queryset.filter(best_season=season)
+    if min_budget is not None:
+        queryset = queryset.filter(avg_budget__gte=min_budget)
+    if max_budget is not None:
+        queryset = queryset.filter(avg_budget__lte=max_budget)
+    return queryset
+
+
+def _terms(query):
+    """Words of a search query, lower-cased; punctuation is ignored."""
+    return re.findall(r'\w+', query.lower())
+
+
+def _fts_match(terms):
+    """FTS5 query: every term must match; the last one may be a prefix ("par" finds Paris)"""
+    return ' '.join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+
+
+def _tsquery(terms):
+    """PostgreSQL to_tsquery() text with the same semantics as _fts_match()"""
+    return ' & '.join([*terms[:-1], f'{terms[-1]}:*'])
+
+
+def _search_sqlite(queryset, terms, limit):
+    match = _fts_match(terms)
+    ids_sql, ids_params = queryset.order_by().values('pk').query.sql_with_params()
+    # MATERIALIZED runs the MATCH once; as a plain rowid IN constraint on the
+    # FTS table SQLite would re-run it for every candidate row
+    sql = (
+        f'WITH hits AS MATERIALIZED ('
+        f'SELECT rowid, bm25({FTS_TABLE}, %s, %s, %s) AS score FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        f') SELECT rowid, score FROM hits WHERE rowid IN ({ids_sql}) ORDER BY score'
+    )
+    params = [*SQLITE_WEIGHTS, match, *ids_params]
+    if limit is not None:
+        sql += ' LIMIT %s'
+        params.append(limit)
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(sql, params)
+        scores = cursor.fetchall()
+
+    found = queryset.in_bulk([pk for pk, _ in scores])
+    results = []
+    for pk, score in scores:
+        destination = found[pk]
+        destination.rank = round(-score, 4)  # bm25() is lower-is-better
+        results.append(destination)
+    return results
+
+
+def _search_postgres(queryset, terms, limit):
+    tsquery = "to_tsquery('english', %s)"
+    text = _tsquery(terms)
+    results = (
+        queryset
+        .filter(RawSQL(f'({POSTGRES_DOCUMENT}) @@ {tsquery}', [text], output_field=BooleanField()))
+        .annotate(rank=RawSQL(f'ts_rank({POSTGRES_DOCUMENT}, {tsquery})', [text], output_field=FloatField()))
+        .order_by('-rank', 'name', 'pk')
+    )
+    return list(results if limit is None else results[:limit])
+
+
+def _contains_all(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(name__icontains=term) | Q(country__icontains=term) | Q(description__icontains=term)
+        )
+    return queryset
+
+
+def _search_fallback(queryset, terms, limit):
+    queryset = _contains_all(queryset, terms).order_by('name', 'pk')
+    results = list(queryset if limit is None else queryset[:limit])
+    for destination in results:
+        destination.rank = None
+    return results
+
+
+def search_destinations(queryset, query, limit=None):
+    """
+    Full-text search within a destination queryset, best match first.
+
+    Args:
+        queryset: Destination queryset, e.g. from filter_destinations()
+        query: Search text; every word must match
+        limit: Maximum number of results (None for all)
+
+    Returns:
+        list: Destination instances with a `rank` attribute (higher is better)
+    """
+    terms = _terms(query)
+    if not terms:
+        return []
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        return _search_sqlite(queryset, terms, limit)
+    if vendor == 'postgresql':
+        return _search_postgres(queryset, terms, limit)
+    return _search_fallback(queryset, terms, limit)
+
+
+def match_destinations(queryset, query):
+    """
+    Narrow a destination queryset to the full-text matches of a query, unranked.
+
+    Unlike search_destinations() this stays a queryset, so it can be
+    aggregated (see destinations/facets.py).
+
+    Args:
+        queryset: Destination queryset
+        query: Search text; every word must match
+
+    Returns:
+        QuerySet: The matching destinations
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        return queryset.filter(
+            pk__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [_fts_match(terms)])
+        )
+    if vendor == 'postgresql':
+        return queryset.filter(RawSQL(
+            f"({POSTGRES_DOCUMENT}) @@ to_tsquery('english', %s)", [_tsquery(terms)],
+            output_field=BooleanField(),
+        ))
+    return _contains_all(queryset, terms)
@@ -8,5 +8,13 @@ class DestinationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Destination
         fields = ['id', 'name', 'country', 'description', 'avg_budget', 
-                 'best_season', 'created_at', 'updated_at']
+                 'best_season', 'latitude', 'longitude', 'created_at', 'updated_at']
         read_only_fields = ['created_at', 'updated_at']
+
+
+class DestinationSearchSerializer(DestinationSerializer):
+    """Destination search result with its relevance (higher is better)"""
+    rank = serializers.FloatField(read_only=True, allow_null=True)
+
+    class Meta(DestinationSerializer.Meta):
+        fields = DestinationSerializer.Meta.fields + ['rank']
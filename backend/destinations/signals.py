@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .facets import invalidate_facets
+from .models import Destination
+
+
+@receiver([post_save, post_delete], sender=Destination)
+def drop_cached_facets(sender, **kwargs):
+    """Facet counts change with every saved or deleted destination"""
+    invalidate_facets()
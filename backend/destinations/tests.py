@@ -1,3 +1,226 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Destination
+from .search import _terms, _tsquery
+
+
+@override_settings(OPENWEATHER_API_KEY='')
+class DestinationQueryCountTests(TestCase):
+    """Destination pages and API must run a fixed number of queries however many rows exist"""
+
+    def setUp(self):
+        cache.clear()
+
+    def add_destinations(self, count):
+        start = Destination.objects.count()
+        return Destination.objects.bulk_create(
+            Destination(
+                name=f'City {i}', country='India', description='A city',
+                avg_budget=20000, best_season='Winter',
+            )
+            for i in range(start, start + count)
+        )
+
+    def test_api_list(self):
+        # validators, destinations; cursor pagination runs no COUNT(*) of its own
+        url = reverse('destinations:destination-api-list')
+        self.add_destinations(1)
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        self.add_destinations(19)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_api_cursor_pages(self):
+        self.add_destinations(30)
+        response = self.client.get(reverse('destinations:destination-api-list'), {'page_size': 7})
+        names = [item['name'] for item in response.json()['results']]
+        while response.json()['next']:
+            with self.assertNumQueries(2):
+                response = self.client.get(response.json()['next'])
+            names += [item['name'] for item in response.json()['results']]
+        self.assertEqual(names, sorted(f'City {i}' for i in range(30)))
+
+    def test_list_page(self):
+        # page count, destinations and the facet counts; weather comes from the cache and the client
+        self.add_destinations(1)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('destinations:list'))
+        self.add_destinations(19)
+        cache.clear()  # bulk_create() sends no signals to drop the cached facet counts
+        with self.assertNumQueries(3):
+            self.client.get(reverse('destinations:list'))
+        # Facet counts are now cached
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('destinations:list'), {'country': 'India'})
+        self.assertContains(response, 'City 19')
+
+    @override_settings(DESTINATION_PAGE_SIZE=8)
+    def test_list_page_is_paged(self):
+        self.add_destinations(20)
+        response = self.client.get(reverse('destinations:list'), {'country': 'India', 'page': 3})
+        names = sorted(f'City {i}' for i in range(20))
+        self.assertEqual([destination.name for destination in response.context['destinations']], names[16:])
+        self.assertContains(response, 'Page 3 of 3')
+        self.assertContains(response, '?country=India&amp;page=2')
+
+    def test_detail_page(self):
+        destination = Destination.objects.create(
+            name='Goa', country='India', description='Beaches', avg_budget=15000, best_season='Winter',
+        )
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('destinations:detail', args=[destination.pk]))
+        self.assertContains(response, 'Goa')
+
+
+@override_settings(OPENWEATHER_API_KEY='')
+class DestinationSearchTests(TestCase):
+    """Full-text search with filters, through the page and the API"""
+
+    def setUp(self):
+        cache.clear()
+        rows = [
+            ('Goa', 'India', 'Sunny beaches, seafood and nightlife.', 15000, 'Winter'),
+            ('Manali', 'India', 'Snow-capped mountains and river rafting.', 20000, 'Summer'),
+            ('Bali', 'Indonesia', 'Temples, rice terraces and beaches.', 60000, 'Summer'),
+            ('Paris', 'France', 'Museums, cafés and the Eiffel Tower.', 150000, 'Spring'),
+        ]
+        for name, country, description, budget, season in rows:
+            Destination.objects.create(
+                name=name, country=country, description=description, avg_budget=budget, best_season=season,
+            )
+
+    def search(self, **params):
+        response = self.client.get(reverse('destinations:destination-api-search'), params)
+        return [item['name'] for item in response.json()['results']]
+
+    def test_ranks_name_matches_first(self):
+        Destination.objects.create(
+            name='Beaches Resort', country='India', description='A resort.', avg_budget=30000, best_season='Winter',
+        )
+        self.assertEqual(self.search(q='beaches'), ['Beaches Resort', 'Goa', 'Bali'])
+
+    def test_every_word_must_match_and_last_is_a_prefix(self):
+        self.assertEqual(self.search(q='beaches temp'), ['Bali'])
+        self.assertEqual(self.search(q='eiffel'), ['Paris'])
+        self.assertEqual(self.search(q='cafes'), ['Paris'])
+
+    def test_postgres_query_matches_like_fts(self):
+        # PostgreSQL isn't available to the test suite; check the tsquery it is sent
+        self.assertEqual(_tsquery(_terms('Beaches, temp')), 'beaches & temp:*')
+        self.assertEqual(_tsquery(_terms('par')), 'par:*')
+
+    def test_filters(self):
+        self.assertEqual(self.search(q='beaches', country='India'), ['Goa'])
+        self.assertEqual(self.search(q='beaches', season='Summer'), ['Bali'])
+        self.assertEqual(self.search(q='beaches', min_budget=20000, max_budget=100000), ['Bali'])
+        self.assertEqual(self.search(q='india', max_budget=18000), ['Goa'])
+
+    def test_index_follows_changes(self):
+        goa = Destination.objects.get(name='Goa')
+        goa.description = 'Old churches and spice farms.'
+        goa.save()
+        self.assertEqual(self.search(q='beaches'), ['Bali'])
+        self.assertEqual(self.search(q='churches'), ['Goa'])
+        goa.delete()
+        self.assertEqual(self.search(q='churches'), [])
+
+    def test_invalid_requests(self):
+        url = reverse('destinations:destination-api-search')
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'q': 'goa', 'min_budget': 5, 'max_budget': 1}).status_code, 400)
+
+    def test_list_api_filters(self):
+        response = self.client.get(reverse('destinations:destination-api-list'), {'country': 'India'})
+        self.assertEqual([item['name'] for item in response.json()['results']], ['Goa', 'Manali'])
+
+    def test_search_page(self):
+        # FTS lookup, the matching rows, and the facet counts of all matches
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('destinations:list'), {'q': 'beaches', 'country': 'Indonesia'})
+        self.assertEqual([destination.name for destination in response.context['destinations']], ['Bali'])
+
+    def facets(self, **params):
+        response = self.client.get(reverse('destinations:list'), params)
+        return {
+            name: {facet['value']: facet['count'] for facet in values}
+            for name, values in response.context['facets'].items()
+        }
+
+    def test_facet_counts(self):
+        facets = self.facets()
+        self.assertEqual(facets['country'], {'France': 1, 'India': 2, 'Indonesia': 1})
+        self.assertEqual(facets['season'], {'Spring': 1, 'Summer': 2, 'Winter': 1})
+        self.assertEqual(facets['budget'], {'budget': 2, 'mid': 0, 'premium': 1, 'luxury': 1})
+
+    def test_facets_count_other_selections(self):
+        # A facet's own selection doesn't narrow its counts; the others do
+        facets = self.facets(country='India')
+        self.assertEqual(facets['country'], {'France': 1, 'India': 2, 'Indonesia': 1})
+        self.assertEqual(facets['season'], {'Summer': 1, 'Winter': 1})
+        facets = self.facets(season='Summer', min_budget=50000, max_budget=99999)
+        self.assertEqual(facets['country'], {'Indonesia': 1})
+        self.assertEqual(facets['budget'], {'budget': 1, 'mid': 0, 'premium': 1, 'luxury': 0})
+
+    def test_facets_follow_search_and_custom_budget(self):
+        self.assertEqual(self.facets(q='beaches')['country'], {'India': 1, 'Indonesia': 1})
+        self.assertEqual(self.facets(min_budget=18000)['country'], {'France': 1, 'India': 1, 'Indonesia': 1})
+
+    def test_facets_refresh_when_destinations_change(self):
+        self.facets()
+        Destination.objects.create(
+            name='Kyoto', country='Japan', description='Temples.', avg_budget=90000, best_season='Autumn',
+        )
+        facets = self.facets()
+        self.assertEqual(facets['country']['Japan'], 1)
+        self.assertEqual(facets['budget']['premium'], 2)
+        Destination.objects.get(name='Kyoto').delete()
+        self.assertNotIn('Japan', self.facets()['country'])
+
+
+class DestinationConditionalGetTests(TestCase):
+    """The API answers unchanged destinations with 304 from one aggregate query"""
+
+    def setUp(self):
+        self.destination = Destination.objects.create(
+            name='Goa', country='India', description='Beaches', avg_budget=15000, best_season='Winter',
+        )
+
+    def test_list_and_detail(self):
+        for url in (reverse('destinations:destination-api-list'),
+                    reverse('destinations:destination-api-detail', args=[self.destination.pk])):
+            response = self.client.get(url)
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_changes_invalidate(self):
+        url = reverse('destinations:destination-api-detail', args=[self.destination.pk])
+        etag = self.client.get(url)['ETag']
+        self.destination.description = 'Beaches and forts'
+        self.destination.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_list_has_no_last_modified(self):
+        # A deletion leaves max(updated_at) unchanged, so only the ETag can catch it
+        Destination.objects.create(
+            name='Kyoto', country='Japan', description='Temples', avg_budget=90000, best_season='Spring',
+        )
+        url = reverse('destinations:destination-api-list')
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('Last-Modified', self.client.get(
+            reverse('destinations:destination-api-detail', args=[self.destination.pk])
+        ))
+        Destination.objects.get(name='Kyoto').delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_destination_is_404(self):
+        response = self.client.get(reverse('destinations:destination-api-detail', args=[0]))
+        self.assertEqual(response.status_code, 404)
@@ -1,39 +1,107 @@
+from django.conf import settings
+from django.core.paginator import Paginator
 from django.shortcuts import render, get_object_or_404
-from rest_framework import viewsets
+from rest_framework import serializers, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from conditional_get import ConditionalGetMixin
+from .facets import get_facets
+from .forms import DestinationSearchForm
 from .models import Destination
-from .serializers import DestinationSerializer
-from weather.utils import get_weather_data
+from .pagination import DestinationCursorPagination
+from .serializers import DestinationSearchSerializer, DestinationSerializer
+from weather.cache import mark_destinations_viewed
+from weather.utils import get_destinations_weather
 
 
-class DestinationViewSet(viewsets.ReadOnlyModelViewSet):
+class DestinationViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for viewing destinations.
-    Provides list and detail views via REST API.
+    Provides list and detail views via REST API, with ETag/Last-Modified.
     """
     queryset = Destination.objects.all()
     serializer_class = DestinationSerializer
+    pagination_class = DestinationCursorPagination
+
+    def _search_form(self):
+        form = DestinationSearchForm(self.request.query_params)
+        if not form.is_valid():
+            raise serializers.ValidationError(form.errors)
+        return form
+
+    def get_queryset(self):
+        """The list accepts the country, season, min_budget and max_budget filters"""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = self._search_form().filter(queryset)
+        return queryset
+
+    @action(detail=False)
+    def search(self, request):
+        """
+        Ranked full-text search over name, country and description.
+
+        Takes the search text in `q`, the list filters, and `limit` (default
+        DESTINATION_SEARCH_LIMIT, at most API_MAX_PAGE_SIZE).
+        """
+        form = self._search_form()
+        if not form.cleaned_data['q'].strip():
+            raise serializers.ValidationError({'q': ['Enter something to search for.']})
+        try:
+            limit = min(int(request.query_params['limit']), settings.API_MAX_PAGE_SIZE)
+        except (KeyError, ValueError):
+            limit = settings.DESTINATION_SEARCH_LIMIT
+        results = form.search(Destination.objects.all(), limit=max(limit, 1))
+        return Response({'results': DestinationSearchSerializer(results, many=True).data})
 
 
 def destination_list(request):
-    """Display list of all destinations"""
-    destinations = Destination.objects.all()
+    """Display destinations, searched and filtered, with current weather on each card"""
+    form = DestinationSearchForm(request.GET)
+    if form.is_valid():
+        results = form.search(Destination.objects.all(), limit=settings.DESTINATION_SEARCH_LIMIT)
+        facets = get_facets(form, request.GET)
+    else:
+        results = Destination.objects.all()
+        facets = None
+
+    # Ranked search results are already cut to DESTINATION_SEARCH_LIMIT; anything
+    # else is paged so the page (and its weather fan-out) stays bounded
+    page_obj = None
+    if isinstance(results, list):
+        destinations = results
+    else:
+        paginator = Paginator(results.order_by('name', 'pk'), settings.DESTINATION_PAGE_SIZE)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        destinations = list(page_obj)
+
+    # Fetch weather for every card concurrently, within one latency budget
+    weather = get_destinations_weather(destinations)
+    for destination in destinations:
+        destination.weather = weather.get(destination.pk)
+    mark_destinations_viewed(destination.pk for destination in destinations)
+
     context = {
         'destinations': destinations,
+        'page_obj': page_obj,
+        'form': form,
+        'facets': facets,
         'page_title': 'Browse Destinations'
     }
     return render(request, 'destinations/destination_list.html', context)
 
 
 def destination_detail(request, pk):
-    """Display details of a specific destination with weather information"""
+    """
+    Display details of a specific destination.
+    The weather card is loaded afterwards from the weather widget endpoint,
+    so this page never waits on the weather API.
+    """
     destination = get_object_or_404(Destination, pk=pk)
-    
-    # Fetch weather data for the destination
-    weather_data = get_weather_data(destination.name)
-    
+    mark_destinations_viewed([destination.pk])
+
     context = {
         'destination': destination,
-        'weather': weather_data,
         'page_title': destination.name
     }
     return render(request, 'destinations/destination_detail.html', context)
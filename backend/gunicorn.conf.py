@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration.
+
+SERVER_MODE=wsgi (default) serves backend.wsgi with sync workers.
+SERVER_MODE=asgi serves backend.asgi with uvicorn workers; the AI pages then
+use async views, so slow Groq calls don't tie up a worker each.
+"""
+from decouple import config
+
+SERVER_MODE = config('SERVER_MODE', default='wsgi')
+
+bind = f"0.0.0.0:{config('PORT', default='8000')}"
+workers = config('WEB_CONCURRENCY', default=2, cast=int)
+timeout = config('GUNICORN_TIMEOUT', default=120, cast=int)
+
+if SERVER_MODE == 'asgi':
+    wsgi_app = 'backend.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'backend.wsgi:application'
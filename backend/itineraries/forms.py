@@ -1,6 +1,7 @@
 from django import forms
 from .models import Itinerary, DayPlan
 from destinations.models import Destination
+from .parsing import parse_day_plans
 
 
 class ItineraryForm(forms.ModelForm):
@@ -31,3 +32,28 @@ class DayPlanForm(forms.ModelForm):
                 'placeholder': 'Describe your activities for this day...'
             }),
         }
+
+
+class AIItineraryForm(forms.Form):
+    """Form for saving an AI-generated plan as an itinerary"""
+    destination = forms.ModelChoiceField(
+        queryset=Destination.objects.all(),
+        widget=forms.Select(attrs={'class': 'form-control'})
+    )
+    title = forms.CharField(
+        max_length=200,
+        widget=forms.TextInput(attrs={'class': 'form-control'})
+    )
+    start_date = forms.DateField(
+        widget=forms.DateInput(attrs={'class': 'form-control', 'type': 'date'})
+    )
+    plan = forms.CharField(widget=forms.HiddenInput)
+
+    def clean_plan(self):
+        """Parse the AI text into day plans"""
+        day_plans = parse_day_plans(self.cleaned_data['plan'])
+        if not day_plans:
+            raise forms.ValidationError('No "Day 1", "Day 2", ... sections were found in the plan.')
+        if day_plans[-1][0] > 60:
+            raise forms.ValidationError('The plan covers too many days to save as one itinerary.')
+        return day_plans
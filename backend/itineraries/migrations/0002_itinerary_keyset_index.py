@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("itineraries", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="itinerary",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="itineraries_user_id_84696b_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 from destinations.models import Destination
 
@@ -15,12 +15,46 @@ class Itinerary(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination of a user's itineraries (ItineraryCursorPagination)
+            models.Index(fields=['user', '-created_at', '-id']),
+        ]
         verbose_name = 'Itinerary'
         verbose_name_plural = 'Itineraries'
 
     def __str__(self):
         return f"{self.title} - {self.user.username}"
 
+    @classmethod
+    def create_with_day_plans(cls, user, destination, title, start_date, day_plans):
+        """
+        Create an itinerary and all of its day plans in one transaction.
+
+        Args:
+            user: Owner of the itinerary
+            destination: Destination the trip is to
+            title: Itinerary title
+            start_date: First day of the trip
+            day_plans: (day_number, plan) tuples with unique day numbers,
+                       e.g. from itineraries.parsing.parse_day_plans()
+
+        Returns:
+            Itinerary: The new itinerary; days covers the highest day number
+        """
+        with transaction.atomic():
+            itinerary = cls.objects.create(
+                user=user,
+                destination=destination,
+                title=title,
+                start_date=start_date,
+                days=max(day_number for day_number, _ in day_plans),
+            )
+            DayPlan.objects.bulk_create(
+                DayPlan(itinerary=itinerary, day_number=day_number, plan=plan)
+                for day_number, plan in day_plans
+            )
+        return itinerary
+
     @property
     def end_date(self):
         """Calculate end date based on start date and number of days"""
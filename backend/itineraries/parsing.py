@@ -0,0 +1,42 @@
+"""
+Parser for AI-generated itinerary text.
+
+The assistant is prompted to answer with "DAY 1:" style headings followed by
+Morning/Afternoon/Evening lines, but models also emit markdown variants such
+as "**Day 1: Arrival**" or "### Day 2 - Old Town". Everything between two day
+headings becomes that day's plan; text before the first heading is dropped.
+"""
+import re
+
+# A line that starts a day: optional markdown decoration, "Day N", then either
+# a separator and an optional title or the end of the line. Without the
+# separator, prose such as "Day 2 will be busier" or "Day 10 km trek" would
+# start a new day and move text out of the one it belongs to.
+DAY_HEADING = re.compile(
+    r'^[ \t#*_>-]*day[ \t]*(\d{1,3})(?:[ \t*_]*[:.)\-–—]+[ \t]*(.*?))?[ \t*_:]*$',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def parse_day_plans(text):
+    """
+    Split an AI itinerary into day plans.
+
+    Args:
+        text (str): Itinerary as returned by generate_itinerary_plan()
+
+    Returns:
+        list: (day_number, plan) tuples ordered by day; repeated headings for
+              the same day are merged and empty days are left out
+    """
+    headings = list(DAY_HEADING.finditer(text or ''))
+    days = {}
+    for i, heading in enumerate(headings):
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        body = text[heading.end():end].strip()
+        title = (heading.group(2) or '').strip('*_ ')
+        plan = f'{title}\n{body}' if title and body else title or body
+        day_number = int(heading.group(1))
+        if plan and day_number > 0:
+            days[day_number] = f'{days[day_number]}\n\n{plan}' if day_number in days else plan
+    return sorted(days.items())
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import DayPlan, Itinerary
+
+
+@receiver([post_save, post_delete], sender=DayPlan)
+def touch_itinerary(sender, instance, raw=False, origin=None, **kwargs):
+    """Day plans are part of their itinerary's API body, so bump its updated_at"""
+    if raw or isinstance(origin, Itinerary):
+        # Fixture loading, or the itinerary itself is being deleted
+        return
+    Itinerary.objects.filter(pk=instance.itinerary_id).update(updated_at=timezone.now())
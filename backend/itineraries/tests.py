@@ -1,3 +1,191 @@
-from django.test import TestCase
+from datetime import date
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from destinations.models import Destination
+from .models import DayPlan, Itinerary
+from .parsing import parse_day_plans
+
+
+class ItineraryQueryCountTests(TestCase):
+    """Itinerary pages and API must run a fixed number of queries however many rows exist"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('traveller', password='secret')
+        self.client.force_login(self.user)
+
+    def add_itineraries(self, count, days=3):
+        """Create `count` itineraries, each to its own destination and fully planned."""
+        start = Itinerary.objects.count()
+        for i in range(start, start + count):
+            destination = Destination.objects.create(
+                name=f'City {i}', country='India', description='A city',
+                avg_budget=20000, best_season='Winter',
+            )
+            itinerary = Itinerary.objects.create(
+                user=self.user, destination=destination, title=f'Trip {i}',
+                start_date=date(2025, 1, 1), days=days,
+            )
+            DayPlan.objects.bulk_create(
+                DayPlan(itinerary=itinerary, day_number=day, plan=f'Day {day}')
+                for day in range(1, days + 1)
+            )
+        return itinerary
+
+    def test_api_list(self):
+        # session, user, validators, itineraries with user and destination, day plans
+        url = reverse('itineraries:itinerary-api-list')
+        self.add_itineraries(1)
+        with self.assertNumQueries(5):
+            self.client.get(url)
+        self.add_itineraries(9, days=7)
+        with self.assertNumQueries(5):
+            response = self.client.get(url)
+        self.assertEqual(len(response.json()['results']), 10)
+        self.assertEqual(len(response.json()['results'][0]['day_plans']), 7)
+
+    def test_api_cursor_pages(self):
+        self.add_itineraries(25)
+        response = self.client.get(reverse('itineraries:itinerary-api-list'), {'page_size': 10})
+        seen = [item['id'] for item in response.json()['results']]
+        while response.json()['next']:
+            # Later pages cost the same as the first: no COUNT(*) and no OFFSET scan
+            with self.assertNumQueries(5):
+                response = self.client.get(response.json()['next'])
+            seen += [item['id'] for item in response.json()['results']]
+        self.assertEqual(seen, sorted(seen, reverse=True))
+        self.assertEqual(len(set(seen)), 25)
+
+    @override_settings(API_MAX_PAGE_SIZE=15)
+    def test_api_page_size_is_capped(self):
+        self.add_itineraries(20, days=1)
+        response = self.client.get(reverse('itineraries:itinerary-api-list'), {'page_size': 500})
+        self.assertEqual(len(response.json()['results']), 15)
+
+    def test_api_detail(self):
+        # session, user, validators, itinerary with user and destination, day plans
+        itinerary = self.add_itineraries(1, days=10)
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('itineraries:itinerary-api-detail', args=[itinerary.pk]))
+        self.assertEqual(response.json()['destination_name'], itinerary.destination.name)
+
+    def test_list_page(self):
+        # session, user, itineraries with destinations
+        self.add_itineraries(1)
+        with self.assertNumQueries(3):
+            self.client.get(reverse('itineraries:list'))
+        self.add_itineraries(9)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('itineraries:list'))
+        self.assertContains(response, 'City 9')
+        self.assertContains(response, '3 day plans')
+
+    def test_detail_page(self):
+        # session, user, itinerary with destination, day plans
+        itinerary = self.add_itineraries(1, days=14)
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('itineraries:detail', args=[itinerary.pk]))
+        self.assertContains(response, '14 of 14')
+
+    def test_dayplan_edit_page(self):
+        # session, user, day plan with itinerary
+        day_plan = self.add_itineraries(1).day_plans.first()
+        with self.assertNumQueries(3):
+            self.client.get(reverse('itineraries:dayplan-edit', args=[day_plan.pk]))
+
+
+class ItineraryConditionalGetTests(TestCase):
+    """The API answers unchanged itineraries with 304 from one aggregate query"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('traveller', password='secret')
+        self.client.force_login(self.user)
+        self.destination = Destination.objects.create(
+            name='Goa', country='India', description='Beaches', avg_budget=15000, best_season='Winter',
+        )
+        self.itinerary = Itinerary.create_with_day_plans(
+            self.user, self.destination, 'Beach week', date(2025, 1, 1), [(1, 'Arrive'), (2, 'Beach')],
+        )
+        self.list_url = reverse('itineraries:itinerary-api-list')
+        self.detail_url = reverse('itineraries:itinerary-api-detail', args=[self.itinerary.pk])
+
+    def test_if_none_match(self):
+        for url in (self.list_url, self.detail_url):
+            etag = self.client.get(url)['ETag']
+            # session, user, validators
+            with self.assertNumQueries(3):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_day_plan_changes_invalidate(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        day_plan = self.itinerary.day_plans.get(day_number=2)
+        day_plan.plan = 'Snorkelling'
+        day_plan.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        day_plan.delete()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_deletion_changes_list_etag(self):
+        Itinerary.objects.create(
+            user=self.user, destination=self.destination, title='Older trip', start_date=date(2024, 1, 1), days=1,
+        )
+        etag = self.client.get(self.list_url)['ETag']
+        Itinerary.objects.get(title='Older trip').delete()
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pages_have_their_own_etag(self):
+        self.assertNotEqual(
+            self.client.get(self.list_url)['ETag'],
+            self.client.get(self.list_url, {'page_size': 1})['ETag'],
+        )
+
+
+class ParseDayPlansTests(SimpleTestCase):
+    """AI itinerary text is split into day plans on "Day N" headings only"""
+
+    def test_heading_styles(self):
+        text = (
+            'Here is your plan.\n'
+            '**Day 1: Arrival**\nMorning: Check in\n'
+            '### Day 2 - Old Town\nAfternoon: Walking tour\n'
+            'DAY 3:\nEvening: Dinner cruise\n'
+            '**Day 4**\nRest day\n'
+            'Day 5) Beach\n'
+        )
+        self.assertEqual(parse_day_plans(text), [
+            (1, 'Arrival\nMorning: Check in'),
+            (2, 'Old Town\nAfternoon: Walking tour'),
+            (3, 'Evening: Dinner cruise'),
+            (4, 'Rest day'),
+            (5, 'Beach'),
+        ])
+
+    def test_prose_starting_with_day_is_not_a_heading(self):
+        text = (
+            'Day 1: Arrival\nDay 2 will be busier, so sleep early.\n'
+            'Day 2: Trek\nDay 10 km trek to the lake.\n'
+        )
+        self.assertEqual(parse_day_plans(text), [
+            (1, 'Arrival\nDay 2 will be busier, so sleep early.'),
+            (2, 'Trek\nDay 10 km trek to the lake.'),
+        ])
+
+    def test_repeated_and_empty_days(self):
+        text = 'Day 1: Arrival\nMorning: Check in\nDay 2:\nDay 1\nEvening: Dinner\nDay 0: Nothing\n'
+        self.assertEqual(parse_day_plans(text), [(1, 'Arrival\nMorning: Check in\n\nEvening: Dinner')])
+
+    def test_no_headings(self):
+        self.assertEqual(parse_day_plans('Just some text'), [])
+        self.assertEqual(parse_day_plans(''), [])
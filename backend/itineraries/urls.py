@@ -12,6 +12,7 @@ urlpatterns = [
     # Template views
     path('', views.itinerary_list, name='list'),
     path('create/', views.itinerary_create, name='create'),
+    path('from-ai/', views.itinerary_from_ai, name='from-ai'),
     path('<int:pk>/', views.itinerary_detail, name='detail'),
     path('<int:pk>/edit/', views.itinerary_edit, name='edit'),
     path('<int:pk>/delete/', views.itinerary_delete, name='delete'),
@@ -1,10 +1,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db.models import Count
+from django.views.decorators.http import require_POST
 from rest_framework import viewsets, permissions
+from conditional_get import ConditionalGetMixin
 from .models import Itinerary, DayPlan
+from .pagination import ItineraryCursorPagination
 from .serializers import ItinerarySerializer, DayPlanSerializer
-from .forms import ItineraryForm, DayPlanForm
+from .forms import AIItineraryForm, ItineraryForm, DayPlanForm
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
@@ -16,17 +20,24 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         return obj.user == request.user
 
 
-class ItineraryViewSet(viewsets.ModelViewSet):
+class ItineraryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing itineraries.
     Users can only view and edit their own itineraries.
+    Lists and details carry ETag/Last-Modified; day plan changes touch their itinerary.
     """
+    last_modified_fields = ('updated_at', 'destination__updated_at')
     serializer_class = ItinerarySerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = ItineraryCursorPagination
 
     def get_queryset(self):
-        """Return itineraries for the current user only"""
-        return Itinerary.objects.filter(user=self.request.user)
+        """Return itineraries for the current user only, with everything the serializer reads"""
+        return (
+            Itinerary.objects.filter(user=self.request.user)
+            .select_related('user', 'destination')
+            .prefetch_related('day_plans')
+        )
 
     def perform_create(self, serializer):
         """Set the user when creating an itinerary"""
@@ -36,7 +47,11 @@ class ItineraryViewSet(viewsets.ModelViewSet):
 @login_required
 def itinerary_list(request):
     """Display list of user's itineraries"""
-    itineraries = Itinerary.objects.filter(user=request.user)
+    itineraries = (
+        Itinerary.objects.filter(user=request.user)
+        .select_related('destination')
+        .annotate(day_plan_count=Count('day_plans'))
+    )
     context = {
         'itineraries': itineraries,
         'page_title': 'My Itineraries'
@@ -65,10 +80,32 @@ def itinerary_create(request):
     return render(request, 'itineraries/itinerary_form.html', context)
 
 
+@login_required
+@require_POST
+def itinerary_from_ai(request):
+    """Save an AI-generated plan as an itinerary with one day plan per day"""
+    form = AIItineraryForm(request.POST)
+    if not form.is_valid():
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(request, error)
+        return redirect('ai-planner')
+
+    itinerary = Itinerary.create_with_day_plans(
+        user=request.user,
+        destination=form.cleaned_data['destination'],
+        title=form.cleaned_data['title'],
+        start_date=form.cleaned_data['start_date'],
+        day_plans=form.cleaned_data['plan'],
+    )
+    messages.success(request, f"Itinerary saved with {len(form.cleaned_data['plan'])} day plans!")
+    return redirect('itineraries:detail', pk=itinerary.pk)
+
+
 @login_required
 def itinerary_detail(request, pk):
     """Display details of a specific itinerary"""
-    itinerary = get_object_or_404(Itinerary, pk=pk, user=request.user)
+    itinerary = get_object_or_404(Itinerary.objects.select_related('destination'), pk=pk, user=request.user)
     day_plans = itinerary.day_plans.all()
     
     context = {
@@ -157,7 +194,7 @@ def dayplan_create(request, itinerary_pk):
 @login_required
 def dayplan_edit(request, pk):
     """Edit a day plan"""
-    day_plan = get_object_or_404(DayPlan, pk=pk, itinerary__user=request.user)
+    day_plan = get_object_or_404(DayPlan.objects.select_related('itinerary'), pk=pk, itinerary__user=request.user)
     
     if request.method == 'POST':
         form = DayPlanForm(request.POST, instance=day_plan)
@@ -180,7 +217,7 @@ def dayplan_edit(request, pk):
 @login_required
 def dayplan_delete(request, pk):
     """Delete a day plan"""
-    day_plan = get_object_or_404(DayPlan, pk=pk, itinerary__user=request.user)
+    day_plan = get_object_or_404(DayPlan.objects.select_related('itinerary'), pk=pk, itinerary__user=request.user)
     itinerary = day_plan.itinerary
     
     if request.method == 'POST':
@@ -1,4 +1,12 @@
 from django.contrib import admin
+from .models import WeatherSnapshot
 
-# Register your models here.
-# This app doesn't have models - it uses external API
+
+@admin.register(WeatherSnapshot)
+class WeatherSnapshotAdmin(admin.ModelAdmin):
+    """Admin interface for stored weather observations"""
+    list_display = ('destination', 'observed_at', 'resolution', 'temp', 'description', 'sample_count')
+    list_filter = ('resolution', 'destination')
+    date_hierarchy = 'observed_at'
+    ordering = ('-observed_at',)
+    list_select_related = ('destination',)
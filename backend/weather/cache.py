@@ -0,0 +1,244 @@
+"""
+Weather cache layer built on Django's cache framework.
+
+Results are kept per normalized city name. A fresh entry is served for
+WEATHER_CACHE_TTL seconds; after that it is still served for another
+WEATHER_CACHE_STALE_TTL seconds while a single background thread refreshes it.
+"City not found" and "invalid API key" responses are cached separately for
+WEATHER_ERROR_CACHE_TTL seconds, other errors (timeouts, 5xx) are never cached.
+"""
+import logging
+import threading
+import time
+from collections import Counter
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upstream statuses whose error responses are worth caching
+CACHEABLE_ERROR_STATUSES = (401, 404)
+
+STATS = ('hits', 'misses', 'stale')
+
+
+def normalize_city(city_name):
+    """
+    Normalize a city name so "  New  York" and "new york" share one entry.
+
+    Args:
+        city_name (str): City name as typed or stored
+
+    Returns:
+        str: Lower-cased name with collapsed whitespace
+    """
+    return ' '.join(str(city_name).split()).lower()
+
+
+def _cache_key(kind, city_key):
+    return f'weather:{kind}:{quote(city_key)}'
+
+
+def cache_is_shared():
+    """
+    Whether the default cache is visible to other processes.
+
+    View marks, refreshed entries and counters only reach the web workers'
+    processes (and back) through a shared backend such as Redis; LocMemCache
+    and DummyCache keep them in the current process or nowhere.
+    """
+    return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+
+def _record(stat, count=1):
+    """Add `count` to one of the hit/miss/stale counters."""
+    key = _cache_key('stats', stat)
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # Counter missing or evicted; add() keeps concurrent starts from resetting it
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, count)
+
+
+def get_cache_stats():
+    """
+    Return hit, miss and stale counters for the weather cache.
+
+    Misses are synchronous upstream calls; stale serves trigger at most one
+    background call per city and refresh window.
+
+    Returns:
+        dict: Counters plus the overall hit ratio
+    """
+    keys = {stat: _cache_key('stats', stat) for stat in STATS}
+    values = cache.get_many(keys.values())
+    stats = {stat: values.get(key, 0) for stat, key in keys.items()}
+    total = sum(stats.values())
+    stats['hit_ratio'] = round((stats['hits'] + stats['stale']) / total, 3) if total else 0.0
+    return stats
+
+
+def reset_cache_stats():
+    """Reset all weather cache counters to zero."""
+    cache.delete_many([_cache_key('stats', stat) for stat in STATS])
+
+
+def mark_destinations_viewed(destination_ids):
+    """
+    Record that destinations were just viewed.
+
+    The background refresher only refreshes destinations viewed within the
+    last WEATHER_ACTIVE_WINDOW seconds.
+
+    Args:
+        destination_ids (iterable): Primary keys of the viewed destinations
+    """
+    cache.set_many(
+        {_cache_key('viewed', str(pk)): True for pk in destination_ids},
+        timeout=settings.WEATHER_ACTIVE_WINDOW,
+    )
+
+
+def get_recently_viewed(destination_ids):
+    """
+    Filter destination IDs down to those viewed recently.
+
+    Args:
+        destination_ids (iterable): Primary keys to check
+
+    Returns:
+        set: The subset viewed within WEATHER_ACTIVE_WINDOW seconds
+    """
+    keys = {_cache_key('viewed', str(pk)): pk for pk in destination_ids}
+    return {keys[key] for key in cache.get_many(keys)}
+
+
+def _store(city_key, data):
+    """Cache a fetched result according to its type and return it."""
+    if not data.get('error'):
+        entry = {'data': data, 'fetched_at': time.time()}
+        timeout = settings.WEATHER_CACHE_TTL + settings.WEATHER_CACHE_STALE_TTL
+        cache.set(_cache_key('data', city_key), entry, timeout=timeout)
+        cache.delete(_cache_key('error', city_key))
+    elif data.get('status') in CACHEABLE_ERROR_STATUSES:
+        cache.set(_cache_key('error', city_key), data, timeout=settings.WEATHER_ERROR_CACHE_TTL)
+    return data
+
+
+def _refresh(city_key, fetch):
+    """Background refresh of a stale entry; always releases the refresh lock."""
+    try:
+        _store(city_key, fetch())
+    except Exception:
+        logger.exception('Background weather refresh failed for %s', city_key)
+    finally:
+        cache.delete(_cache_key('refreshing', city_key))
+        # fetch() may have stored a snapshot; don't leak this thread's connection
+        connections.close_all()
+
+
+def _schedule_refresh(city_key, fetch):
+    """Start a refresh thread unless another request already started one."""
+    lock_timeout = max(settings.WEATHER_CACHE_STALE_TTL, 30)
+    if cache.add(_cache_key('refreshing', city_key), True, timeout=lock_timeout):
+        threading.Thread(target=_refresh, args=(city_key, fetch), daemon=True).start()
+
+
+def _serve(city_key, error, entry, fetch):
+    """
+    Pick the response for one city from its cached error and data entries.
+
+    Returns:
+        tuple: (data or None when nothing usable is cached, the stat to count)
+    """
+    if error is not None:
+        return error, 'hits'
+    if entry is not None:
+        if time.time() - entry['fetched_at'] < settings.WEATHER_CACHE_TTL:
+            return entry['data'], 'hits'
+        _schedule_refresh(city_key, fetch)
+        return entry['data'], 'stale'
+    return None, 'misses'
+
+
+def store(city_name, data):
+    """
+    Cache a weather result fetched outside get_or_fetch().
+
+    Args:
+        city_name (str): City the weather is for
+        data (dict): Weather dict as returned by the client
+
+    Returns:
+        dict: The same data
+    """
+    return _store(normalize_city(city_name), data)
+
+
+def get_many_cached(city_names, fetch_for):
+    """
+    Look up several cities in one cache round-trip.
+
+    Stale entries are returned and refreshed in the background like in
+    get_or_fetch(); cities with nothing cached are left out of the result
+    and counted as misses. Each counter is bumped once for the whole batch.
+
+    Args:
+        city_names (iterable): Cities to look up
+        fetch_for (callable): fetch_for(city_name) returns a weather dict
+
+    Returns:
+        dict: city_name -> weather dict for every city found in the cache
+    """
+    city_keys = {city_name: normalize_city(city_name) for city_name in city_names}
+    keys = []
+    for city_key in city_keys.values():
+        keys += [_cache_key('error', city_key), _cache_key('data', city_key)]
+    values = cache.get_many(keys)
+
+    found = {}
+    counts = Counter()
+    for city_name, city_key in city_keys.items():
+        data, stat = _serve(
+            city_key,
+            values.get(_cache_key('error', city_key)),
+            values.get(_cache_key('data', city_key)),
+            lambda city_name=city_name: fetch_for(city_name),
+        )
+        counts[stat] += 1
+        if data is not None:
+            found[city_name] = data
+    for stat, count in counts.items():
+        _record(stat, count)
+    return found
+
+
+def get_or_fetch(city_name, fetch):
+    """
+    Return cached weather for a city, calling fetch() only when needed.
+
+    Args:
+        city_name (str): City the weather is for
+        fetch (callable): Zero-argument callable returning a weather dict
+
+    Returns:
+        dict: Weather data in the format returned by fetch()
+    """
+    city_key = normalize_city(city_name)
+    values = cache.get_many([_cache_key('error', city_key), _cache_key('data', city_key)])
+    data, stat = _serve(
+        city_key,
+        values.get(_cache_key('error', city_key)),
+        values.get(_cache_key('data', city_key)),
+        fetch,
+    )
+    _record(stat)
+    if data is None:
+        data = _store(city_key, fetch())
+    return data
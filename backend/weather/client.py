@@ -0,0 +1,341 @@
+"""
+OpenWeatherMap HTTP client with a pooled, keep-alive session.
+"""
+import os
+import threading
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from circuit_breaker import get_breaker
+from deadlines import DeadlineExceeded, remaining, timeout_for
+
+# Upstream statuses worth retrying; 4xx answers are final
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Maximum city IDs per group request
+GROUP_SIZE = 20
+
+
+class WeatherClient:
+    """
+    Client for the OpenWeatherMap current-weather API.
+
+    Owns one requests.Session whose connection pool is reused across calls, so
+    only the first request per connection pays for the TCP and TLS handshake.
+    Connection errors, read timeouts and 5xx responses are retried a bounded
+    number of times with jittered exponential backoff, except under a request
+    deadline, where each call makes a single attempt so retries and backoff
+    can't run past it.
+    """
+
+    def __init__(self, api_key, api_url, group_url=None, geocoding_url=None,
+                 pool_size=10, max_retries=2, backoff_factor=0.3, backoff_jitter=0.3,
+                 connect_timeout=2.0, read_timeout=4.0):
+        """
+        Initialize the client and its session.
+
+        Args:
+            api_key: OpenWeatherMap API key
+            api_url: Current-weather endpoint URL
+            group_url: Multi-city (group) endpoint URL
+            geocoding_url: Direct geocoding endpoint URL
+            pool_size: Maximum kept-alive connections per host
+            max_retries: Retries for connect/read errors and 5xx responses
+            backoff_factor: Base of the exponential backoff, in seconds
+            backoff_jitter: Maximum random seconds added to each backoff
+            connect_timeout: Seconds to wait for a connection
+            read_timeout: Seconds to wait for the response
+        """
+        self.api_key = api_key
+        self.api_url = api_url
+        self.group_url = group_url
+        self.geocoding_url = geocoding_url
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET']),
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # read=False re-raises a read timeout as requests' Timeout, as without retries
+        single = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=Retry(0, read=False))
+        self.single_session = requests.Session()
+        self.single_session.mount('https://', single)
+        self.single_session.mount('http://', single)
+
+    @classmethod
+    def from_settings(cls):
+        """Build a client from the OPENWEATHER_* and WEATHER_HTTP_* settings."""
+        return cls(
+            api_key=settings.OPENWEATHER_API_KEY,
+            api_url=settings.OPENWEATHER_API_URL,
+            group_url=settings.OPENWEATHER_GROUP_URL,
+            geocoding_url=settings.OPENWEATHER_GEOCODING_URL,
+            pool_size=settings.WEATHER_HTTP_POOL_SIZE,
+            max_retries=settings.WEATHER_HTTP_MAX_RETRIES,
+            backoff_factor=settings.WEATHER_HTTP_BACKOFF,
+            connect_timeout=settings.WEATHER_HTTP_CONNECT_TIMEOUT,
+            read_timeout=settings.WEATHER_HTTP_READ_TIMEOUT,
+        )
+
+    def _timeout(self):
+        """
+        (connect, read) timeouts, cut to the time left before the request deadline.
+
+        Raises:
+            DeadlineExceeded: Too little time is left to start a request
+        """
+        connect, read = self.timeout
+        return timeout_for(connect), timeout_for(read)
+
+    def _session(self):
+        """The retrying session, or the single-attempt one under a request deadline."""
+        return self.session if remaining() is None else self.single_session
+
+    def get_current(self, city_name, city_id=None, lat=None, lon=None):
+        """
+        Fetch current weather data for a given city.
+
+        The lookup uses the provider city ID when given, then coordinates, and
+        only falls back to the free-text city name.
+
+        Args:
+            city_name (str): Name of the city (used for messages and fallback)
+            city_id (int): OpenWeatherMap city ID
+            lat (float): Latitude
+            lon (float): Longitude
+
+        Returns:
+            dict: Weather data containing temperature, description, icon, etc.
+                  On failure, an error dict with 'error': True and a message
+        """
+        # Check if API key is configured
+        if not self.api_key:
+            return {
+                'error': True,
+                'message': 'Weather API key not configured. Please set OPENWEATHER_API_KEY in .env file.',
+                'temp': 'N/A',
+                'description': 'API key not configured',
+                'icon': '01d'
+            }
+
+        try:
+            timeout = self._timeout()
+        except DeadlineExceeded:
+            return {
+                'error': True,
+                'message': 'Weather service timeout. Please try again later.',
+                'temp': 'N/A',
+                'description': 'Request timeout',
+                'icon': '01d'
+            }
+
+        # While OpenWeatherMap is failing, answer at once; callers fall back to stale data
+        breaker = get_breaker('openweathermap')
+        if not breaker.allow():
+            return {
+                'error': True,
+                'message': 'Weather service temporarily unavailable. Please try again later.',
+                'temp': 'N/A',
+                'description': 'Service unavailable',
+                'icon': '01d'
+            }
+
+        params = {
+            'appid': self.api_key,
+            'units': 'metric'  # Use metric units (Celsius)
+        }
+        if city_id:
+            params['id'] = city_id
+        elif lat is not None and lon is not None:
+            params.update(lat=lat, lon=lon)
+        else:
+            params['q'] = city_name
+
+        try:
+            response = self._session().get(self.api_url, params=params, timeout=timeout)
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if response.status_code == 200:
+                return self._parse(response.json())
+
+            elif response.status_code == 404:
+                return {
+                    'error': True,
+                    'status': 404,
+                    'message': f'City "{city_name}" not found in weather database.',
+                    'temp': 'N/A',
+                    'description': 'City not found',
+                    'icon': '01d'
+                }
+
+            elif response.status_code == 401:
+                return {
+                    'error': True,
+                    'status': 401,
+                    'message': 'Invalid API key. Please check OPENWEATHER_API_KEY in .env file.',
+                    'temp': 'N/A',
+                    'description': 'Invalid API key',
+                    'icon': '01d'
+                }
+
+            else:
+                return {
+                    'error': True,
+                    'message': f'Weather service error (Status: {response.status_code})',
+                    'temp': 'N/A',
+                    'description': 'Service unavailable',
+                    'icon': '01d'
+                }
+
+        except requests.exceptions.Timeout:
+            breaker.record_failure()
+            return {
+                'error': True,
+                'message': 'Weather service timeout. Please try again later.',
+                'temp': 'N/A',
+                'description': 'Request timeout',
+                'icon': '01d'
+            }
+
+        except requests.exceptions.RequestException as e:
+            # Retries exhausted on timeouts surface as ConnectionError/RetryError
+            breaker.record_failure()
+            return {
+                'error': True,
+                'message': f'Error fetching weather data: {str(e)}',
+                'temp': 'N/A',
+                'description': 'Connection error',
+                'icon': '01d'
+            }
+
+        except Exception as e:
+            return {
+                'error': True,
+                'message': f'Unexpected error: {str(e)}',
+                'temp': 'N/A',
+                'description': 'Error',
+                'icon': '01d'
+            }
+
+    def get_group(self, city_ids):
+        """
+        Fetch current weather for up to GROUP_SIZE cities in one request.
+
+        Args:
+            city_ids (list): OpenWeatherMap city IDs
+
+        Returns:
+            dict: city_id -> weather dict; cities missing from the answer (or
+                  all of them, if the request fails) are left out
+        """
+        if not self.api_key or not city_ids:
+            return {}
+        try:
+            timeout = self._timeout()
+        except DeadlineExceeded:
+            return {}
+        breaker = get_breaker('openweathermap')
+        if not breaker.allow():
+            return {}
+
+        params = {
+            'id': ','.join(str(city_id) for city_id in city_ids),
+            'appid': self.api_key,
+            'units': 'metric'
+        }
+        try:
+            response = self._session().get(self.group_url, params=params, timeout=timeout)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            return {}
+        if response.status_code >= 500:
+            breaker.record_failure()
+            return {}
+        breaker.record_success()
+        if response.status_code != 200:
+            return {}
+        try:
+            return {item['id']: self._parse(item) for item in response.json().get('list', [])}
+        except (KeyError, ValueError):
+            return {}
+
+    def geocode(self, query):
+        """
+        Resolve a place name to coordinates with the geocoding API.
+
+        Args:
+            query (str): Place name, optionally followed by ",country"
+
+        Returns:
+            tuple: (lat, lon), or None if the place could not be resolved
+        """
+        params = {'q': query, 'limit': 1, 'appid': self.api_key}
+        response = self.session.get(self.geocoding_url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        results = response.json()
+        if not results:
+            return None
+        return results[0]['lat'], results[0]['lon']
+
+    @staticmethod
+    def _parse(data):
+        """Extract the fields the templates use from an API response."""
+        return {
+            'error': False,
+            'temp': round(data['main']['temp']),
+            'temp_min': round(data['main']['temp_min']),
+            'temp_max': round(data['main']['temp_max']),
+            'feels_like': round(data['main']['feels_like']),
+            'humidity': data['main']['humidity'],
+            'pressure': data['main']['pressure'],
+            'description': data['weather'][0]['description'].capitalize(),
+            'icon': data['weather'][0]['icon'],
+            'wind_speed': data['wind']['speed'],
+            'city': data['name'],
+            'country': data['sys']['country'],
+            'city_id': data.get('id')
+        }
+
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+
+
+def get_weather_client():
+    """
+    Return the process-wide WeatherClient, creating it on first use.
+
+    The client is rebuilt after a fork so gunicorn workers never share
+    sockets inherited from the master process.
+
+    Returns:
+        WeatherClient: Shared client for this process
+    """
+    global _client, _client_pid
+    pid = os.getpid()
+    if _client is None or _client_pid != pid:
+        with _client_lock:
+            if _client is None or _client_pid != pid:
+                _client = WeatherClient.from_settings()
+                _client_pid = pid
+    return _client
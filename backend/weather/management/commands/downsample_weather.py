@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from weather.models import WeatherSnapshot
+
+
+class Command(BaseCommand):
+    """Fold old hourly weather snapshots into daily aggregates"""
+    help = 'Apply the weather snapshot retention policy'
+
+    def handle(self, *args, **options):
+        written = WeatherSnapshot.objects.downsample(
+            hourly_days=settings.WEATHER_HOURLY_RETENTION_DAYS,
+            daily_days=settings.WEATHER_DAILY_RETENTION_DAYS,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} daily aggregate(s).'))
@@ -0,0 +1,77 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from destinations.models import Destination
+from weather.cache import cache_is_shared, get_recently_viewed
+from weather.models import WeatherSnapshot
+from weather.utils import refresh_destination_weather
+
+
+class Command(BaseCommand):
+    """
+    Keep destination weather fresh in the cache from a background process.
+
+    Every interval, each recently viewed destination is refreshed once (which
+    also records a WeatherSnapshot) and old snapshots are downsampled. Calls
+    are spread evenly over the interval and never exceed the rate limit, so
+    upstream usage is a fixed budget instead of scaling with page views.
+
+    View marks come from the web processes and refreshed entries are read by
+    them, so this needs a shared cache backend (CACHE_BACKEND).
+    """
+    help = 'Periodically refresh cached weather for recently viewed destinations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run a single refresh cycle and exit')
+        parser.add_argument('--all', action='store_true', help='Refresh every destination, not just recently viewed ones')
+        parser.add_argument('--interval', type=int, default=settings.WEATHER_REFRESH_INTERVAL,
+                            help='Seconds per refresh cycle (default: WEATHER_REFRESH_INTERVAL)')
+        parser.add_argument('--rate', type=int, default=settings.WEATHER_REFRESH_RATE_LIMIT,
+                            help='Maximum upstream calls per minute (default: WEATHER_REFRESH_RATE_LIMIT)')
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            # Exit cleanly so the Procfile's weather process doesn't crash-loop on the default cache
+            self.stderr.write(self.style.WARNING(
+                'refresh_weather needs a shared cache backend: with the process-local default it never sees '
+                'the web workers\' views and they never see its refreshes. Set CACHE_BACKEND and CACHE_LOCATION '
+                'to enable it. Exiting.'
+            ))
+            return
+        interval = options['interval']
+        min_spacing = 60.0 / options['rate']
+
+        while True:
+            cycle_start = time.monotonic()
+            close_old_connections()
+
+            destinations = list(Destination.objects.all())
+            if not options['all']:
+                active = get_recently_viewed(destination.pk for destination in destinations)
+                destinations = [destination for destination in destinations if destination.pk in active]
+
+            if destinations:
+                spacing = max(interval / len(destinations), min_spacing)
+                for i, destination in enumerate(destinations):
+                    # Sleep until this call's slot so calls stay evenly spaced
+                    delay = cycle_start + i * spacing - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    weather = refresh_destination_weather(destination)
+                    status = weather.get('message') if weather.get('error') else 'ok'
+                    self.stdout.write(f'{destination}: {status}')
+
+            self.stdout.write(self.style.SUCCESS(f'Refreshed {len(destinations)} destination(s).'))
+            WeatherSnapshot.objects.downsample(
+                hourly_days=settings.WEATHER_HOURLY_RETENTION_DAYS,
+                daily_days=settings.WEATHER_DAILY_RETENTION_DAYS,
+            )
+            if options['once']:
+                break
+
+            remaining = interval - (time.monotonic() - cycle_start)
+            if remaining > 0:
+                time.sleep(remaining)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from weather.cache import cache_is_shared, get_cache_stats, reset_cache_stats
+
+
+class Command(BaseCommand):
+    """
+    Show (and optionally reset) weather cache hit/miss/stale counters.
+
+    The counters are kept in the cache by the web workers, so this only
+    reports them with a shared cache backend (CACHE_BACKEND); a process-local
+    cache would always read zeros here.
+    """
+    help = 'Show weather cache hit, miss and stale counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Reset the counters after printing them')
+
+    def handle(self, *args, **options):
+        if not cache_is_shared():
+            raise CommandError(
+                'weather_cache_stats needs a shared cache backend: the counters live in each web worker\'s '
+                'process-local cache. Set CACHE_BACKEND and CACHE_LOCATION.'
+            )
+        stats = get_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} stale={stats['stale']} "
+            f"hit_ratio={stats['hit_ratio']:.1%}"
+        )
+        if options['reset']:
+            reset_cache_stats()
+            self.stdout.write(self.style.SUCCESS('Weather cache counters reset.'))
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("destinations", "0002_destination_weather_location"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WeatherSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "observed_at",
+                    models.DateTimeField(
+                        help_text="Start of the hour (or day) the observation covers"
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[("hourly", "Hourly"), ("daily", "Daily aggregate")],
+                        default="hourly",
+                        max_length=10,
+                    ),
+                ),
+                ("temp", models.FloatField()),
+                ("temp_min", models.FloatField()),
+                ("temp_max", models.FloatField()),
+                ("feels_like", models.FloatField()),
+                ("humidity", models.PositiveSmallIntegerField()),
+                ("pressure", models.PositiveIntegerField()),
+                ("wind_speed", models.FloatField()),
+                ("description", models.CharField(max_length=100)),
+                ("icon", models.CharField(max_length=10)),
+                (
+                    "sample_count",
+                    models.PositiveIntegerField(
+                        default=1, help_text="Observations folded into this row"
+                    ),
+                ),
+                (
+                    "destination",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="weather_snapshots",
+                        to="destinations.destination",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Weather Snapshot",
+                "verbose_name_plural": "Weather Snapshots",
+                "ordering": ["-observed_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["destination", "observed_at"],
+                        name="weather_wea_destina_64defe_idx",
+                    )
+                ],
+                "unique_together": {("destination", "resolution", "observed_at")},
+            },
+        ),
+    ]
@@ -1,4 +1,191 @@
-from django.db import models
+from datetime import datetime, time, timedelta
 
-# Create your models here.
-# This app doesn't need models as it fetches data from external API
+from django.db import models, transaction
+from django.db.models import Avg, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from destinations.models import Destination
+
+
+class WeatherSnapshotQuerySet(models.QuerySet):
+    """Query helpers for stored weather observations"""
+
+    def latest_for(self, destination):
+        """Return the most recent snapshot for a destination, or None"""
+        return self.filter(destination=destination).order_by('-observed_at').first()
+
+    def trend(self, destination, days=7):
+        """
+        Daily temperature trend for a destination over the last N days.
+
+        Args:
+            destination: Destination instance
+            days: Number of days to look back
+
+        Returns:
+            list: Dicts with 'day', 'high', 'low' and 'avg', oldest first
+        """
+        since = timezone.now() - timedelta(days=days)
+        return list(
+            self.filter(destination=destination, observed_at__gte=since)
+            .annotate(day=TruncDate('observed_at'))
+            .values('day')
+            .annotate(high=Max('temp_max'), low=Min('temp_min'), avg=Avg('temp'))
+            .order_by('day')
+        )
+
+    def downsample(self, hourly_days=7, daily_days=365):
+        """
+        Apply the retention policy.
+
+        Hourly snapshots older than `hourly_days` are folded into one daily
+        aggregate per destination and day; daily aggregates older than
+        `daily_days` are deleted.
+
+        Returns:
+            int: Number of daily aggregates written
+        """
+        now = timezone.now()
+        cutoff = (now - timedelta(days=hourly_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        old_hourly = self.filter(resolution=WeatherSnapshot.RESOLUTION_HOURLY, observed_at__lt=cutoff)
+
+        groups = (
+            old_hourly
+            .annotate(day=TruncDate('observed_at'))
+            .values('destination_id', 'day')
+            .annotate(
+                temp=Avg('temp'),
+                temp_min=Min('temp_min'),
+                temp_max=Max('temp_max'),
+                feels_like=Avg('feels_like'),
+                humidity=Avg('humidity'),
+                pressure=Avg('pressure'),
+                wind_speed=Avg('wind_speed'),
+                samples=Sum('sample_count'),
+                last_observed=Max('observed_at'),
+            )
+        )
+
+        written = 0
+        with transaction.atomic():
+            for group in groups:
+                # Description and icon come from the last observation of the day
+                last = old_hourly.filter(
+                    destination_id=group['destination_id'], observed_at=group['last_observed']
+                ).values('description', 'icon').first()
+                day_start = timezone.make_aware(datetime.combine(group['day'], time.min))
+                self.update_or_create(
+                    destination_id=group['destination_id'],
+                    resolution=WeatherSnapshot.RESOLUTION_DAILY,
+                    observed_at=day_start,
+                    defaults={
+                        'temp': group['temp'],
+                        'temp_min': group['temp_min'],
+                        'temp_max': group['temp_max'],
+                        'feels_like': group['feels_like'],
+                        'humidity': round(group['humidity']),
+                        'pressure': round(group['pressure']),
+                        'wind_speed': group['wind_speed'],
+                        'description': last['description'],
+                        'icon': last['icon'],
+                        'sample_count': group['samples'],
+                    },
+                )
+                written += 1
+            old_hourly.delete()
+            self.filter(
+                resolution=WeatherSnapshot.RESOLUTION_DAILY,
+                observed_at__lt=now - timedelta(days=daily_days),
+            ).delete()
+        return written
+
+
+class WeatherSnapshot(models.Model):
+    """Model representing a stored weather observation for a destination"""
+    RESOLUTION_HOURLY = 'hourly'
+    RESOLUTION_DAILY = 'daily'
+
+    destination = models.ForeignKey(Destination, on_delete=models.CASCADE, related_name='weather_snapshots')
+    observed_at = models.DateTimeField(help_text="Start of the hour (or day) the observation covers")
+    resolution = models.CharField(
+        max_length=10,
+        default=RESOLUTION_HOURLY,
+        choices=[
+            (RESOLUTION_HOURLY, 'Hourly'),
+            (RESOLUTION_DAILY, 'Daily aggregate'),
+        ]
+    )
+    temp = models.FloatField()
+    temp_min = models.FloatField()
+    temp_max = models.FloatField()
+    feels_like = models.FloatField()
+    humidity = models.PositiveSmallIntegerField()
+    pressure = models.PositiveIntegerField()
+    wind_speed = models.FloatField()
+    description = models.CharField(max_length=100)
+    icon = models.CharField(max_length=10)
+    sample_count = models.PositiveIntegerField(default=1, help_text="Observations folded into this row")
+
+    objects = WeatherSnapshotQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-observed_at']
+        unique_together = ['destination', 'resolution', 'observed_at']
+        indexes = [
+            models.Index(fields=['destination', 'observed_at']),
+        ]
+        verbose_name = 'Weather Snapshot'
+        verbose_name_plural = 'Weather Snapshots'
+
+    def __str__(self):
+        return f"{self.destination.name} @ {self.observed_at:%Y-%m-%d %H:%M} ({self.resolution})"
+
+    @classmethod
+    def record(cls, destination, weather):
+        """
+        Store a fetched observation, keeping at most one row per hour.
+
+        Args:
+            destination: Destination the weather is for
+            weather: Successful weather dict from the weather client
+
+        Returns:
+            WeatherSnapshot: The hourly snapshot written
+        """
+        hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+        snapshot, _ = cls.objects.update_or_create(
+            destination=destination,
+            resolution=cls.RESOLUTION_HOURLY,
+            observed_at=hour,
+            defaults={
+                'temp': weather['temp'],
+                'temp_min': weather['temp_min'],
+                'temp_max': weather['temp_max'],
+                'feels_like': weather['feels_like'],
+                'humidity': weather['humidity'],
+                'pressure': weather['pressure'],
+                'wind_speed': weather['wind_speed'],
+                'description': weather['description'],
+                'icon': weather['icon'],
+            },
+        )
+        return snapshot
+
+    def as_weather(self):
+        """Return the snapshot in the weather dict format the templates use"""
+        return {
+            'error': False,
+            'temp': round(self.temp),
+            'temp_min': round(self.temp_min),
+            'temp_max': round(self.temp_max),
+            'feels_like': round(self.feels_like),
+            'humidity': self.humidity,
+            'pressure': self.pressure,
+            'description': self.description,
+            'icon': self.icon,
+            'wind_speed': self.wind_speed,
+            'city': self.destination.name,
+            'country': self.destination.country,
+            'observed_at': self.observed_at,
+        }
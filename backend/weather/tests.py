@@ -1,3 +1,70 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, override_settings
+
+from .cache import get_cache_stats, get_many_cached, get_or_fetch, store
+
+SUNNY = {'error': False, 'temp': 30, 'description': 'Sunny', 'icon': '01d'}
+NOT_FOUND = {'error': True, 'status': 404, 'message': 'City not found', 'temp': 'N/A'}
+TIMEOUT = {'error': True, 'message': 'Weather service timeout', 'temp': 'N/A'}
+
+
+@override_settings(WEATHER_CACHE_TTL=600, WEATHER_CACHE_STALE_TTL=1800, WEATHER_ERROR_CACHE_TTL=120)
+class WeatherCacheTests(SimpleTestCase):
+    """Weather is served fresh, then stale while one refresh runs, then fetched again"""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 10000.0
+        patcher = mock.patch('weather.cache.time.time', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fresh_entries_are_served_from_the_cache(self):
+        fetch = mock.Mock(return_value=SUNNY)
+        self.assertEqual(get_or_fetch('  New  York', fetch), SUNNY)
+        self.assertEqual(get_or_fetch('new york', fetch), SUNNY)
+        fetch.assert_called_once()
+        self.assertEqual(get_cache_stats()['misses'], 1)
+        self.assertEqual(get_cache_stats()['hits'], 1)
+
+    def test_stale_entries_are_served_while_one_refresh_runs(self):
+        store('Goa', SUNNY)
+        self.now += 601
+        fetch = mock.Mock(return_value=dict(SUNNY, temp=31))
+        with mock.patch('weather.cache.threading.Thread') as thread:
+            self.assertEqual(get_or_fetch('Goa', fetch), SUNNY)
+            self.assertEqual(get_or_fetch('Goa', fetch), SUNNY)
+        # The refresh lock lets only the first stale read start a refresh
+        thread.assert_called_once()
+        fetch.assert_not_called()
+        self.assertEqual(get_cache_stats()['stale'], 2)
+
+        self.now += 1800
+        self.assertEqual(get_or_fetch('Goa', fetch)['temp'], 31)
+        fetch.assert_called_once()
+
+    def test_only_final_errors_are_cached(self):
+        fetch = mock.Mock(return_value=NOT_FOUND)
+        get_or_fetch('Atlantis', fetch)
+        get_or_fetch('Atlantis', fetch)
+        fetch.assert_called_once()
+
+        fetch = mock.Mock(return_value=TIMEOUT)
+        get_or_fetch('Goa', fetch)
+        get_or_fetch('Goa', fetch)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_many_cached_counts_each_stat_once_per_batch(self):
+        for city in ('A', 'B', 'C'):
+            store(city, SUNNY)
+        store('D', NOT_FOUND)
+        get_many_cached(['A', 'E'], mock.Mock())  # Creates the hit and miss counters
+        incr = mock.Mock(wraps=caches['default'].incr)
+        with mock.patch.object(caches['default'], 'incr', incr):
+            found = get_many_cached(['A', 'B', 'C', 'D', 'E', 'F'], mock.Mock())
+        self.assertEqual(set(found), {'A', 'B', 'C', 'D'})
+        self.assertEqual(incr.call_count, 2)
+        stats = get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['stale']), (5, 3, 0))
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'weather'
+
+urlpatterns = [
+    path('destination/<int:destination_id>/', views.weather_widget, name='widget'),
+    path('api/destination/<int:destination_id>/', views.weather_api, name='api'),
+]
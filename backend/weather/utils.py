@@ -1,122 +1,205 @@
 """
 Weather API utility functions for fetching weather data from OpenWeatherMap API.
 """
-import requests
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+
 from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from deadlines import remaining
+
+from .cache import CACHEABLE_ERROR_STATUSES, get_many_cached, get_or_fetch, store
+from .client import GROUP_SIZE, get_weather_client
+from .models import WeatherSnapshot
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
 
 
-def get_weather_data(city_name):
+def _get_executor():
+    """Return the process-wide thread pool used for bulk weather fetches."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.WEATHER_BULK_MAX_WORKERS,
+                    thread_name_prefix='weather',
+                )
+    return _executor
+
+
+def _in_pool(task):
     """
-    Fetch current weather data for a given city from OpenWeatherMap API.
-    
+    Run a pool task with the thread's DB connection checked before and after.
+
+    Pool threads live as long as the process; without this a connection
+    broken by a database restart would fail every later snapshot write.
+    """
+    close_old_connections()
+    try:
+        return task()
+    finally:
+        close_old_connections()
+
+
+def _run_concurrently(tasks, timeout):
+    """
+    Run zero-argument callables on the shared pool and merge their results.
+
+    Each task returns a dict; tasks still running after `timeout` seconds are
+    left to finish in the background and their results are dropped.
+    """
+    results = {}
+    if not tasks:
+        return results
+    executor = _get_executor()
+    futures = [executor.submit(_in_pool, task) for task in tasks]
+    timeout = timeout if timeout is not None else settings.WEATHER_BULK_TIMEOUT
+    # Never wait past the request deadline (see deadlines.py)
+    left = remaining()
+    done, _ = wait(futures, timeout=timeout if left is None else max(0, min(timeout, left)))
+    for future in done:
+        try:
+            results.update(future.result())
+        except Exception:
+            logger.exception('Bulk weather fetch failed')
+    return results
+
+
+def destination_weather_key(destination):
+    """
+    Return the cache key for a destination's weather.
+
+    Keys are based on the provider city ID or coordinates when known, so
+    renaming a destination does not orphan its cache entry.
+    """
+    if destination.weather_city_id:
+        return f'id:{destination.weather_city_id}'
+    if destination.latitude is not None and destination.longitude is not None:
+        return f'coord:{destination.latitude:.4f},{destination.longitude:.4f}'
+    return destination.name
+
+
+def fetch_destination_weather(destination):
+    """
+    Fetch current weather for a destination, bypassing the cache.
+
+    Uses the stored OpenWeatherMap city ID or coordinates when available and
+    falls back to the destination name. Successful observations are stored
+    as WeatherSnapshot rows.
+
     Args:
-        city_name (str): Name of the city to fetch weather for
-        
+        destination (Destination): Destination to fetch weather for
+
     Returns:
-        dict: Weather data containing temperature, description, icon, etc.
-              Returns None if API key is not configured or request fails
+        dict: Weather data as returned by WeatherClient.get_current(): temperature,
+              description, icon, etc., or an error dict with 'error': True
     """
-    api_key = settings.OPENWEATHER_API_KEY
-    
-    # Check if API key is configured
-    if not api_key or api_key == '':
-        return {
-            'error': True,
-            'message': 'Weather API key not configured. Please set OPENWEATHER_API_KEY in .env file.',
-            'temp': 'N/A',
-            'description': 'API key not configured',
-            'icon': '01d'
-        }
-    
-    try:
-        # OpenWeatherMap API endpoint
-        url = settings.OPENWEATHER_API_URL
-        
-        # Parameters for the API request
-        params = {
-            'q': city_name,
-            'appid': api_key,
-            'units': 'metric'  # Use metric units (Celsius)
-        }
-        
-        # Make the API request
-        response = requests.get(url, params=params, timeout=5)
-        
-        # Check if request was successful
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Extract relevant weather information
-            weather_info = {
-                'error': False,
-                'temp': round(data['main']['temp']),
-                'temp_min': round(data['main']['temp_min']),
-                'temp_max': round(data['main']['temp_max']),
-                'feels_like': round(data['main']['feels_like']),
-                'humidity': data['main']['humidity'],
-                'pressure': data['main']['pressure'],
-                'description': data['weather'][0]['description'].capitalize(),
-                'icon': data['weather'][0]['icon'],
-                'wind_speed': data['wind']['speed'],
-                'city': data['name'],
-                'country': data['sys']['country']
-            }
-            
-            return weather_info
-        
-        elif response.status_code == 404:
-            return {
-                'error': True,
-                'message': f'City "{city_name}" not found in weather database.',
-                'temp': 'N/A',
-                'description': 'City not found',
-                'icon': '01d'
-            }
-        
-        elif response.status_code == 401:
-            return {
-                'error': True,
-                'message': 'Invalid API key. Please check OPENWEATHER_API_KEY in .env file.',
-                'temp': 'N/A',
-                'description': 'Invalid API key',
-                'icon': '01d'
-            }
-        
-        else:
-            return {
-                'error': True,
-                'message': f'Weather service error (Status: {response.status_code})',
-                'temp': 'N/A',
-                'description': 'Service unavailable',
-                'icon': '01d'
-            }
-    
-    except requests.exceptions.Timeout:
-        return {
-            'error': True,
-            'message': 'Weather service timeout. Please try again later.',
-            'temp': 'N/A',
-            'description': 'Request timeout',
-            'icon': '01d'
-        }
-    
-    except requests.exceptions.RequestException as e:
-        return {
-            'error': True,
-            'message': f'Error fetching weather data: {str(e)}',
-            'temp': 'N/A',
-            'description': 'Connection error',
-            'icon': '01d'
-        }
-    
-    except Exception as e:
-        return {
-            'error': True,
-            'message': f'Unexpected error: {str(e)}',
-            'temp': 'N/A',
-            'description': 'Error',
-            'icon': '01d'
-        }
+    weather = get_weather_client().get_current(
+        destination.name,
+        city_id=destination.weather_city_id,
+        lat=destination.latitude,
+        lon=destination.longitude,
+    )
+    if not weather.get('error'):
+        WeatherSnapshot.record(destination, weather)
+    return weather
+
+
+def get_destination_weather(destination):
+    """
+    Get current weather for a destination, served from the weather cache.
+
+    If the API is unreachable and nothing is cached, the latest stored
+    snapshot is served instead (marked with its 'observed_at' time).
+
+    Args:
+        destination (Destination): Destination to fetch weather for
+
+    Returns:
+        dict: Weather data in the format of fetch_destination_weather()
+    """
+    weather = get_or_fetch(destination_weather_key(destination), lambda: fetch_destination_weather(destination))
+    if weather.get('error') and weather.get('status') not in CACHEABLE_ERROR_STATUSES:
+        snapshot = WeatherSnapshot.objects.latest_for(destination)
+        max_age = timedelta(seconds=settings.WEATHER_SNAPSHOT_FALLBACK_MAX_AGE)
+        if snapshot is not None and timezone.now() - snapshot.observed_at <= max_age:
+            return snapshot.as_weather()
+    return weather
+
+
+def refresh_destination_weather(destination):
+    """
+    Fetch a destination's weather from the API and replace its cache entry.
+
+    Args:
+        destination (Destination): Destination to refresh
+
+    Returns:
+        dict: The fetched weather data
+    """
+    return store(destination_weather_key(destination), fetch_destination_weather(destination))
+
+
+def _fetch_group(destinations):
+    """Fetch one group request worth of destinations and cache the results."""
+    by_id = get_weather_client().get_group([destination.weather_city_id for destination in destinations])
+    results = {}
+    for destination in destinations:
+        if destination.weather_city_id in by_id:
+            weather = by_id[destination.weather_city_id]
+            WeatherSnapshot.record(destination, weather)
+            key = destination_weather_key(destination)
+            results[key] = store(key, weather)
+    return results
+
+
+def get_destinations_weather(destinations, timeout=None):
+    """
+    Get current weather for several destinations within one latency budget.
+
+    Cached destinations are read in a single cache round-trip; the rest are
+    fetched concurrently on a bounded thread pool, those with an OpenWeatherMap
+    city ID through the multi-city group endpoint, GROUP_SIZE per request.
+    Fetches still running when the budget runs out are left out of the result
+    but keep running and land in the cache for the next request.
+
+    Args:
+        destinations (iterable): Destination instances
+        timeout (float): Seconds to wait for upstream fetches
+                         (default: WEATHER_BULK_TIMEOUT)
+
+    Returns:
+        dict: destination pk -> weather dict (missing if not available in time)
+    """
+    destinations = list(destinations)
+    by_key = {destination_weather_key(destination): destination for destination in destinations}
+    results = get_many_cached(by_key, lambda key: fetch_destination_weather(by_key[key]))
+
+    missing = [destination for key, destination in by_key.items() if key not in results]
+    grouped = [destination for destination in missing if destination.weather_city_id]
+    tasks = [
+        lambda chunk=grouped[i:i + GROUP_SIZE]: _fetch_group(chunk)
+        for i in range(0, len(grouped), GROUP_SIZE)
+    ]
+    tasks += [
+        lambda destination=destination: {destination_weather_key(destination): refresh_destination_weather(destination)}
+        for destination in missing if not destination.weather_city_id
+    ]
+    results.update(_run_concurrently(tasks, timeout))
+
+    return {
+        destination.pk: results[destination_weather_key(destination)]
+        for destination in destinations
+        if destination_weather_key(destination) in results
+    }
 
 
 def get_weather_icon_url(icon_code):
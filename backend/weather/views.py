@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils.cache import patch_cache_control
+
+from destinations.models import Destination
+from .models import WeatherSnapshot
+from .utils import get_destination_weather
+
+
+def _cache_headers(response, weather):
+    """Let browsers reuse a weather answer; errors are kept only briefly."""
+    if weather.get('error'):
+        max_age = settings.WEATHER_ERROR_CACHE_TTL
+    else:
+        max_age = settings.WEATHER_WIDGET_MAX_AGE
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
+
+
+def weather_widget(request, destination_id):
+    """HTML fragment with the current weather card for a destination"""
+    destination = get_object_or_404(Destination, pk=destination_id)
+    weather = get_destination_weather(destination)
+    context = {
+        'weather': weather,
+        'trend': WeatherSnapshot.objects.trend(destination, days=7),
+    }
+    response = render(request, 'weather/weather_widget.html', context)
+    return _cache_headers(response, weather)
+
+
+def weather_api(request, destination_id):
+    """Current weather for a destination as JSON"""
+    destination = get_object_or_404(Destination, pk=destination_id)
+    weather = get_destination_weather(destination)
+    return _cache_headers(JsonResponse(weather), weather)